@@ -0,0 +1,115 @@
+import os
+from typing import Any, Callable, Dict, List, Tuple
+import numpy as np
+from PIL import Image
+
+from deck_manifest import file_digest, fingerprint
+
+
+def file_key(path: str) -> Tuple[str, int, int]:
+    """Identify a file version by absolute path, mtime and size."""
+    stat = os.stat(path)
+    return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+
+
+class RenderCache:
+    """Small per-key cache of rendered images (e.g. a suit at each requested size), oldest evicted first."""
+
+    def __init__(self, capacity: int = 32):
+        self.capacity = capacity
+        self._entries: Dict[Any, Image.Image] = {}
+
+    def get(self, key, build: Callable[[], Image.Image]) -> Image.Image:
+        image = self._entries.get(key)
+        if image is None:
+            image = build()
+            if len(self._entries) >= self.capacity:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = image
+        return image
+
+
+class AssetMemo:
+    """In-process memo of prepared card assets.
+
+    Each asset role ("back", "front", a suit name, "font") keeps the last value it
+    was built for, together with its key: the source file version plus whatever
+    parameters shape that asset. A role is rebuilt only when its key changes.
+    With capacity > 1 a role keeps its most recently used values for that many
+    keys, so several parameter variants can share one memo.
+    """
+
+    def __init__(self, capacity: int = 1):
+        self.capacity = max(capacity, 1)
+        self._entries: Dict[str, List[Tuple[Any, Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def contains(self, role: str, key) -> bool:
+        return any(entry_key == key for entry_key, _ in self._entries.get(role, ()))
+
+    def get(self, role: str, key, build: Callable[[], Any]):
+        entries = self._entries.setdefault(role, [])
+        for index, (entry_key, value) in enumerate(entries):
+            if entry_key == key:
+                self.hits += 1
+                entries.append(entries.pop(index))
+                return value
+        self.misses += 1
+        value = build()
+        entries.append((key, value))
+        del entries[:-self.capacity]
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+
+class BakedAssetCache:
+    """On-disk cache of normalized card assets stored as raw .npy pixel arrays.
+
+    Entries are keyed by the sha256 of the source file plus the parameters used to
+    bake it, and are opened with numpy memory-mapping so a fresh process attaches
+    to resized fronts/backs and recoloured suits without decoding any PNG.
+    """
+
+    MODES = {3: 'RGB', 4: 'RGBA'}
+
+    def __init__(self, cache_folder: str):
+        self.cache_folder = cache_folder
+        os.makedirs(cache_folder, exist_ok=True)
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+
+    def source_digest(self, path: str) -> str:
+        key = file_key(path)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = self._digests[key] = file_digest(path)
+        return digest
+
+    def entry_path(self, role: str, path: str, params) -> str:
+        key = fingerprint([self.source_digest(path), params])
+        return os.path.join(self.cache_folder, f"{role}-{key[:24]}.npy")
+
+    def get_image(self, role: str, path: str, params, build: Callable[[], Image.Image]) -> Image.Image:
+        """Return the baked image for (source file, params), baking and storing it on a miss."""
+        entry_path = self.entry_path(role, path, params)
+        if os.path.exists(entry_path):
+            try:
+                return self._attach(np.load(entry_path, mmap_mode='r'))
+            except (OSError, ValueError) as e:
+                print(f"Rebuilding unreadable baked asset {entry_path}: {e}")
+
+        image = build()
+        if image.mode not in ('L', 'RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.asarray(image))
+        os.replace(tmp_path, entry_path)
+        return image
+
+    def _attach(self, pixels: np.ndarray) -> Image.Image:
+        mode = 'L' if pixels.ndim == 2 else self.MODES[pixels.shape[2]]
+        size = (pixels.shape[1], pixels.shape[0])
+        return Image.frombuffer(mode, size, pixels, 'raw', mode, 0, 1)
@@ -0,0 +1,105 @@
+import io
+import os
+import queue
+import threading
+from typing import List, Tuple
+from PIL import Image
+
+from deck_trace import trace_span
+
+
+def save_card(canvas: Image.Image, path: str):
+    """PNG-encode a card canvas in memory, then write it to path (traced as separate stages)."""
+    buffer = io.BytesIO()
+    with trace_span("png encode"):
+        canvas.save(buffer, format="PNG")
+    with trace_span("disk write"):
+        with open(path, 'wb') as f:
+            f.write(buffer.getbuffer())
+
+
+def output_pyramid(canvas: Image.Image, levels: List[Tuple[str, Tuple[int, int]]]):
+    """Yield (subfolder, image) per output level, largest first.
+
+    Each level is downsampled in memory from the previous one, so the full-size
+    canvas is only ever read once.
+    """
+    current = canvas
+    for subfolder, size in levels:
+        if current.size != tuple(size):
+            with trace_span("downsample"):
+                current = current.resize(size, Image.LANCZOS)
+        yield subfolder, current
+
+
+def write_card_outputs(canvas: Image.Image, output_folder: str, filename: str, levels=None):
+    """Save a card canvas at every output level; level subfolder "" is the output folder itself."""
+    for subfolder, image in output_pyramid(canvas, levels or [("", canvas.size)]):
+        folder = os.path.join(output_folder, subfolder)
+        if subfolder:
+            os.makedirs(folder, exist_ok=True)
+        save_card(image, os.path.join(folder, filename))
+
+
+class CardWriter:
+    """Encode and write finished card canvases on a pool of background threads.
+
+    The render stage calls submit() with each finished canvas. At most
+    max_in_flight canvases are held at any time (queued or being encoded);
+    submit() blocks until a slot frees up, which keeps memory bounded.
+    """
+
+    def __init__(self, output_folder: str, writer_threads: int = 2, max_in_flight: int = 4, on_written=None):
+        self.output_folder = output_folder
+        self.on_written = on_written
+        self.written = 0
+        self.error = None
+        self._slots = threading.Semaphore(max(max_in_flight, 1))
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = [threading.Thread(target=self._run, name=f"card-writer-{i}", daemon=True)
+                         for i in range(max(writer_threads, 1))]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, canvas: Image.Image, filename: str, levels=None):
+        """Queue a card canvas for writing, at every output level when levels is given."""
+        if self.error:
+            raise self.error
+        self._slots.acquire()
+        self._queue.put((canvas, filename, levels))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            canvas, filename, levels = item
+            try:
+                write_card_outputs(canvas, self.output_folder, filename, levels)
+                with self._lock:
+                    self.written += 1
+                    written = self.written
+                print(f"Generated: {filename}")
+                if self.on_written:
+                    self.on_written(written, filename)
+            except Exception as e:
+                self.error = self.error or e
+            finally:
+                self._slots.release()
+
+    def close(self) -> int:
+        """Wait until every submitted canvas is written; return the number of files written."""
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        if self.error:
+            raise self.error
+        return self.written
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
@@ -0,0 +1,77 @@
+import concurrent.futures
+from typing import Callable, Dict, Tuple
+from PIL import Image
+
+from deckgen import CardConstants
+from deck_manifest import fingerprint
+
+
+class ContactSheet:
+    """All card faces in one grid, values across and suits down (13x4 for a full deck).
+
+    Faces are rendered directly at the thumbnail scale on a thread pool (at this
+    size a card takes milliseconds, far less than starting worker processes) and
+    are pasted into the sheet as they complete. Each cell is cached under its
+    card fingerprint, so the next sheet only re-renders cards whose inputs changed.
+    """
+
+    def __init__(self, scale: float = 0.1, padding: int = 4, background=(32, 32, 32)):
+        self.scale = scale
+        self.padding = padding
+        self.background = background
+        self._cells: Dict[int, Tuple[str, Image.Image]] = {}
+        self.rendered = 0
+        self.reused = 0
+
+    def cell_origin(self, card_id: int, cell_size: Tuple[int, int], columns: int) -> Tuple[int, int]:
+        row, column = divmod(card_id, columns)
+        return (self.padding + column * (cell_size[0] + self.padding),
+                self.padding + row * (cell_size[1] + self.padding))
+
+    def sheet_size(self, cell_size: Tuple[int, int], columns: int, rows: int) -> Tuple[int, int]:
+        return (columns * (cell_size[0] + self.padding) + self.padding,
+                rows * (cell_size[1] + self.padding) + self.padding)
+
+    def render(self, deckgen, workers: int = 4, on_cell: Callable = None, stop_callback: Callable = None) -> Image.Image:
+        """Render the sheet for a loaded DeckGen and return it.
+
+        on_cell(card_id, image, origin) is called for every cell as it is filled,
+        cached cells first; stop_callback() is polled between cells.
+        """
+        generator = deckgen.preview_generator(deckgen.preview_scale(self.scale))
+        columns, rows = len(CardConstants.VALUES), len(CardConstants.SUITS)
+        cell_size = generator.half_card_size
+        sheet = Image.new('RGB', self.sheet_size(cell_size, columns, rows), self.background)
+        self.rendered = self.reused = 0
+
+        def place(card_id, image):
+            origin = self.cell_origin(card_id, cell_size, columns)
+            sheet.paste(image, origin)
+            if on_cell:
+                on_cell(card_id, image, origin)
+
+        stale = []
+        deck_fingerprint = generator.deck_fingerprint()
+        for card_id, suit, value in generator.card_sequence():
+            key = fingerprint([generator.card_fingerprint(card_id, suit, value, deck_fingerprint), generator.scale])
+            cached = self._cells.get(card_id)
+            if cached and cached[0] == key:
+                self.reused += 1
+                place(card_id, cached[1])
+            else:
+                stale.append((card_id, suit, value, key))
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+            futures = {executor.submit(generator.render_card, card_id, suit, value, face_only=True): (card_id, key)
+                       for card_id, suit, value, key in stale}
+            for future in concurrent.futures.as_completed(futures):
+                if stop_callback and stop_callback():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                card_id, key = futures[future]
+                image = future.result()
+                self._cells[card_id] = (key, image)
+                self.rendered += 1
+                place(card_id, image)
+        return sheet
@@ -0,0 +1,65 @@
+import os
+import json
+from typing import Dict, List, Tuple
+from PIL import Image
+
+from card_writer import save_card
+
+ATLAS_INDEX_SUFFIX = "_atlas.json"
+
+
+class DeckAtlas:
+    """Packs card faces into fixed-grid atlas pages with a JSON index of UV rectangles.
+
+    Cells are filled row by row; when a page's columns x rows cells are used up a
+    new page is started. Pages are allocated once and faces are rendered straight
+    into them through cell_origin().
+    """
+
+    def __init__(self, cell_size: Tuple[int, int], columns: int = 8, rows: int = 7, padding: int = 0):
+        if columns < 1 or rows < 1:
+            raise ValueError(f"Invalid atlas grid {columns}x{rows}")
+        self.cell_size = cell_size
+        self.columns = columns
+        self.rows = rows
+        self.padding = padding
+        self.page_size = (columns * (cell_size[0] + padding) + padding, rows * (cell_size[1] + padding) + padding)
+        self.pages: List[Image.Image] = []
+        self.cells: Dict[str, dict] = {}
+
+    def cell_origin(self, name: str) -> Tuple[Image.Image, Tuple[int, int]]:
+        """Reserve the next free cell for name; return its page and top-left pixel."""
+        slot = len(self.cells)
+        page_index, cell = divmod(slot, self.columns * self.rows)
+        row, column = divmod(cell, self.columns)
+        while len(self.pages) <= page_index:
+            self.pages.append(Image.new('RGB', self.page_size))
+
+        x = self.padding + column * (self.cell_size[0] + self.padding)
+        y = self.padding + row * (self.cell_size[1] + self.padding)
+        w, h = self.cell_size
+        page_w, page_h = self.page_size
+        self.cells[name] = {
+            "page": page_index,
+            "x": x, "y": y, "w": w, "h": h,
+            "uv": [x / page_w, y / page_h, (x + w) / page_w, (y + h) / page_h],
+        }
+        return self.pages[page_index], (x, y)
+
+    def save(self, output_folder: str, prefix: str) -> List[str]:
+        """Write the atlas pages as PNGs plus {prefix}_atlas.json; return the written filenames."""
+        page_files = [f"{prefix}_atlas_{i:02d}.png" for i in range(len(self.pages))]
+        for page, filename in zip(self.pages, page_files):
+            save_card(page, os.path.join(output_folder, filename))
+
+        index = {
+            "pages": page_files,
+            "page_size": list(self.page_size),
+            "cell_size": list(self.cell_size),
+            "grid": [self.columns, self.rows],
+            "cells": self.cells,
+        }
+        index_file = f"{prefix}{ATLAS_INDEX_SUFFIX}"
+        with open(os.path.join(output_folder, index_file), 'w') as f:
+            json.dump(index, f, indent=2)
+        return page_files + [index_file]
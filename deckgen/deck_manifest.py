@@ -0,0 +1,94 @@
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, Iterable
+
+MANIFEST_FILENAME = "deckgen_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def file_digest(path: str) -> str:
+    """Return the sha256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint(data) -> str:
+    """Return a stable sha256 hex digest of a JSON-serializable value."""
+    encoded = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class DeckManifest:
+    """Per-output-folder record of which card files were rendered from which inputs.
+
+    Each entry maps an output filename to the card fingerprint it was rendered
+    from, plus the size and mtime of the written file, so a later run can skip
+    cards whose inputs and output file are both unchanged. Pyramid levels
+    written to size subfolders are recorded and checked the same way. With the
+    split layout, card entries also name the shared back file they pair with.
+    """
+
+    def __init__(self, output_folder: str):
+        self.output_folder = output_folder
+        self.path = os.path.join(output_folder, MANIFEST_FILENAME)
+        self.cards: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable manifest {self.path}: {e}")
+            return
+        if data.get("version") == MANIFEST_VERSION:
+            self.cards = data.get("cards", {})
+
+    def is_current(self, filename: str, card_fingerprint: str) -> bool:
+        entry = self.cards.get(filename)
+        if not entry or entry.get("fingerprint") != card_fingerprint:
+            return False
+        files = [("", entry)] + list(entry.get("levels", {}).items())
+        for subfolder, state in files:
+            try:
+                stat = os.stat(os.path.join(self.output_folder, subfolder, filename))
+            except OSError:
+                return False
+            if stat.st_size != state.get("size") or stat.st_mtime_ns != state.get("mtime_ns"):
+                return False
+        return True
+
+    def file_state(self, path: str) -> dict:
+        stat = os.stat(os.path.join(self.output_folder, path))
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    def record(self, filename: str, card_fingerprint: str, save: bool = True, back: str = None,
+               levels: Iterable[str] = ()):
+        """Record a freshly written card file and its pyramid level subfolders.
+
+        The manifest is saved right away so an interrupted run can resume.
+        """
+        entry = {"fingerprint": card_fingerprint, **self.file_state(filename)}
+        level_states = {subfolder: self.file_state(os.path.join(subfolder, filename)) for subfolder in levels if subfolder}
+        if level_states:
+            entry["levels"] = level_states
+        with self._lock:
+            self.cards[filename] = entry
+            if back:
+                self.cards[filename]["back"] = back
+            if save:
+                self.save()
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"version": MANIFEST_VERSION, "cards": self.cards}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
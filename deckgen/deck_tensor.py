@@ -0,0 +1,111 @@
+from typing import Dict, Iterator, List, Tuple
+import numpy as np
+from PIL import Image
+
+from deck_trace import trace_span
+
+
+def split_alpha(image: Image.Image) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (premultiplied rgb as uint32, alpha as uint32) arrays for an RGBA image."""
+    pixels = np.asarray(image.convert('RGBA'), dtype=np.uint32)
+    alpha = pixels[..., 3:4]
+    return pixels[..., :3] * alpha, alpha
+
+
+def blend(dst: np.ndarray, premultiplied: np.ndarray, alpha: np.ndarray) -> np.ndarray:
+    """Alpha-blend a premultiplied source over uint8 dst with Pillow's paste rounding.
+
+    Computes (dst * (255 - a) + src * a + 128) rescaled by 255 exactly as
+    Image.paste(src, box, mask) does, so results match the Pillow path bit for bit.
+    Any leading batch axes broadcast.
+    """
+    tmp = dst.astype(np.uint32) * (255 - alpha) + premultiplied + 128
+    return ((tmp + (tmp >> 8)) >> 8).astype(np.uint8)
+
+
+def clip_rect(position: Tuple[int, int], size: Tuple[int, int], bounds: Tuple[int, int]):
+    """Clip a pasted rectangle to the destination like Image.paste does.
+
+    Returns (dst slices, src slices) as (rows, columns) pairs, or None when nothing overlaps.
+    """
+    x, y = position
+    left, top = max(x, 0), max(y, 0)
+    right, bottom = min(x + size[0], bounds[0]), min(y + size[1], bounds[1])
+    if right <= left or bottom <= top:
+        return None
+    return ((slice(top, bottom), slice(left, right)),
+            (slice(top - y, bottom - y), slice(left - x, right - x)))
+
+
+class TensorCompositor:
+    """Batched NumPy compositing backend for PokerCardGenerator.
+
+    One suit's cards are rendered together as a (n, h, w, 3) uint8 array: the
+    shared front with its central pip is blended once and broadcast, then the
+    per-card index stamps (all the same size) are stacked and blended into every
+    card in a single vectorized operation per corner. The back half, when
+    included, is broadcast in as well.
+    """
+
+    def __init__(self, generator):
+        self.generator = generator
+        self._faces: Dict[str, np.ndarray] = {}
+
+    def face(self, suit: str) -> np.ndarray:
+        """The front half with the central suit blended in, shared by all cards of a suit."""
+        face = self._faces.get(suit)
+        if face is None:
+            generator = self.generator
+            front = np.asarray(generator.input_data.front_image.convert('RGB')).copy()
+            suit_image = generator.input_data.suit_images[suit]
+            x = (generator.half_card_size[0] - suit_image.width) // 2
+            y = (generator.half_card_size[1] - suit_image.height) // 2
+            clipped = clip_rect((x, y), suit_image.size, (front.shape[1], front.shape[0]))
+            if clipped:
+                (rows, columns), (src_rows, src_columns) = clipped
+                premultiplied, alpha = split_alpha(suit_image)
+                front[rows, columns] = blend(front[rows, columns], premultiplied[src_rows, src_columns],
+                                             alpha[src_rows, src_columns])
+            face = self._faces[suit] = front
+        return face
+
+    def render_suit(self, suit: str, values: List[str], with_back: bool = True) -> np.ndarray:
+        """Render the given values of one suit; returns a (len(values), h, w, 3) uint8 array."""
+        generator = self.generator
+        half_w, half_h = generator.half_card_size
+        width = half_w * 2 if with_back else half_w
+
+        with trace_span("tensor composite", suit=suit, cards=len(values)):
+            batch = np.empty((len(values), half_h, width, 3), dtype=np.uint8)
+            batch[:, :, :half_w] = self.face(suit)
+            if with_back:
+                batch[:, :, half_w:] = np.asarray(generator.input_data.back_image.convert('RGB'))
+
+            stamps = [generator.index_stamps(value, suit) for value in values]
+            margin = generator.index_margin
+            for corner in (0, 1):
+                # Stamps share one size in practice; group by size so the blend stays a single stacked op
+                by_size: Dict[Tuple[int, int], List[int]] = {}
+                for index, pair in enumerate(stamps):
+                    by_size.setdefault(pair[corner].size, []).append(index)
+                for (w, h), indices in by_size.items():
+                    x, y = (margin, margin) if corner == 0 else (half_w - margin - w, half_h - margin - h)
+                    clipped = clip_rect((x, y), (w, h), (half_w, half_h))
+                    if not clipped:
+                        continue
+                    (rows, columns), (src_rows, src_columns) = clipped
+                    premultiplied, alpha = zip(*(split_alpha(stamps[index][corner]) for index in indices))
+                    premultiplied, alpha = np.stack(premultiplied), np.stack(alpha)
+                    region = batch[indices, rows, columns]
+                    batch[indices, rows, columns] = blend(region, premultiplied[:, src_rows, src_columns],
+                                                          alpha[:, src_rows, src_columns])
+        return batch
+
+    def render_cards(self, cards, with_back: bool = True) -> Iterator[Tuple[Tuple[int, str, str], Image.Image]]:
+        """Yield ((card_count, suit, value), image) for (card_count, suit, value) cards, one suit batch at a time."""
+        cards = list(cards)
+        for suit in dict.fromkeys(suit for _, suit, _ in cards):
+            suit_cards = [card for card in cards if card[1] == suit]
+            batch = self.render_suit(suit, [value for _, _, value in suit_cards], with_back)
+            for card, pixels in zip(suit_cards, batch):
+                yield card, Image.fromarray(pixels, 'RGB')
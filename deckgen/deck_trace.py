@@ -0,0 +1,106 @@
+import os
+import json
+import time
+import threading
+import cProfile
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List
+
+_NULL_SPAN = nullcontext()
+
+
+class Tracer:
+    """Collects timing spans for the render pipeline stages.
+
+    Disabled by default: span() then returns a shared no-op context manager, so
+    instrumented code only pays for one attribute check. Spans are recorded per
+    process; cards rendered in worker processes are not included.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.events: List[dict] = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self.events = []
+        self._origin = time.perf_counter()
+
+    def span(self, name: str, **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, args)
+
+    @contextmanager
+    def _span(self, name: str, args: dict):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            event = {
+                "name": name,
+                "ph": "X",
+                "ts": (start - self._origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+            if args:
+                event["args"] = args
+            with self._lock:
+                self.events.append(event)
+
+    def export_chrome_trace(self, path: str):
+        """Write the spans as Chrome / Perfetto trace event JSON."""
+        with self._lock:
+            events = list(self.events)
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def stage_totals(self) -> Dict[str, dict]:
+        totals: Dict[str, dict] = {}
+        with self._lock:
+            for event in self.events:
+                stage = totals.setdefault(event["name"], {"count": 0, "total_ms": 0.0})
+                stage["count"] += 1
+                stage["total_ms"] += event["dur"] / 1000
+        return totals
+
+    def summary_table(self) -> str:
+        """Per-stage count, total and mean time, slowest stage first."""
+        totals = self.stage_totals()
+        lines = [f"{'stage':<24}{'count':>8}{'total ms':>12}{'mean ms':>10}"]
+        for name, stage in sorted(totals.items(), key=lambda item: -item[1]["total_ms"]):
+            lines.append(f"{name:<24}{stage['count']:>8}{stage['total_ms']:>12.1f}{stage['total_ms'] / stage['count']:>10.2f}")
+        return "\n".join(lines)
+
+    @contextmanager
+    def profile(self, path: str = None):
+        """Run the enclosed block under cProfile and dump the stats to path (when given)."""
+        if not path:
+            yield
+            return
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path)
+            print(f"Profile written to {path}")
+
+
+TRACER = Tracer(enabled=os.environ.get("DECKGEN_TRACE") == "1")
+
+
+def trace_span(name: str, **args):
+    return TRACER.span(name, **args)
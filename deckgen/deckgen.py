@@ -1,14 +1,28 @@
 import os
 import glob
-from dataclasses import dataclass, field
-from typing import Dict, List, Tuple
+import concurrent.futures
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Tuple, Union
 import json
-from PIL import Image, ImageOps, ImageDraw, ImageFont
+from PIL import Image, ImageDraw, ImageFont
 import numpy as np
 import cv2
 from scipy import interpolate
 import yaml
 import traceback
+import copy
+
+from card_writer import CardWriter, write_card_outputs
+from deck_trace import trace_span
+from asset_cache import AssetMemo, BakedAssetCache, RenderCache, file_key
+from deck_atlas import DeckAtlas
+from deck_tensor import TensorCompositor
+from raster_backend import PillowBackend, get_backend
+from suit_sdf import SuitSDF
+from suit_vector import VectorSuit, load_suit_paths
+from deck_manifest import DeckManifest, file_digest, fingerprint
+from param_graph import ALL_STAGES, ASSET_STAGES, PARAM_STAGES, downstream, invalidated_stages
+from param_sweep import SweepAxis, sweep_grid, sweep_variants
 
 DEFAULT_CONFIG = """
 input_folder: "assets/input1"
@@ -22,6 +36,20 @@ app_params:
     main suit scale: 1
     main face scale: 1
     recolor main suit: true
+    suit rendering: raster
+  Generation:
+    workers: 1
+    writer threads: 0
+    max in flight: 4
+    incremental: true
+    asset cache folder: null
+    output layout: cards
+    atlas columns: 8
+    atlas rows: 7
+    atlas scale: 0.25
+    pyramid scales: []
+    compositor: pillow
+    raster backend: pillow
 """
 
 class CardConstants:
@@ -40,6 +68,124 @@ class CardConstants:
     BLACK_COLOR = (60, 60, 60)  # RGB for black
     SMOOTHNESS = 0.0001  # Suit contour smoothness (0.01 to 0.05 is a good range)
 
+def tone_lut(colors, mode: str = "gradient") -> np.ndarray:
+    """Build a 256x3 uint8 lookup table mapping grey levels to colours.
+
+    "gradient" interpolates evenly between the colour stops (two stops black -> colour
+    reproduce ImageOps.colorize exactly); "steps" splits the grey range into flat bands,
+    one per colour (two colours give a two-tone suit).
+    """
+    colors = np.array(colors, dtype=np.int32).reshape(-1, 3)
+    levels = np.arange(256)
+    if mode == "steps":
+        band = np.minimum(levels * len(colors) // 256, len(colors) - 1)
+        return colors[band].astype(np.uint8)
+    if len(colors) == 1:
+        return np.repeat(colors, 256, axis=0).astype(np.uint8)
+    stops = np.linspace(0, 255, len(colors)).round().astype(np.int32)
+    segment = np.clip(np.searchsorted(stops, levels, side='right') - 1, 0, len(colors) - 2)
+    start, end = stops[segment], stops[segment + 1]
+    offset = (levels - start)[:, None]
+    lut = colors[segment] + offset * (colors[segment + 1] - colors[segment]) // (end - start)[:, None]
+    lut[255] = colors[-1]
+    return lut.astype(np.uint8)
+
+def suit_tone_lut(suit, design) -> np.ndarray:
+    """Return the recolour LUT for a suit from the Design params ("recolor tones", "recolor mode")."""
+    is_red = suit in ['heart', 'diamond']
+    color = CardConstants.RED_COLOR if is_red else CardConstants.BLACK_COLOR
+    tones = (design.get("recolor tones") or {}).get("red" if is_red else "black")
+    return tone_lut(tones or [(0, 0, 0), color], design.get("recolor mode", "gradient"))
+
+def recolor_suits(images: Dict[str, Image.Image], luts: Dict[str, np.ndarray]) -> Dict[str, Image.Image]:
+    """Recolour suit images through per-suit LUTs in one vectorized pass, preserving alpha.
+
+    Suits of equal size are stacked into a single (n, h, w) grey array and mapped
+    with one gather through the suits' LUTs packed as RGBA words; the alpha byte is
+    then taken from the source pixels.
+    """
+    by_size: Dict[Tuple[int, int], List[str]] = {}
+    for suit, image in images.items():
+        by_size.setdefault(image.size, []).append(suit)
+
+    alpha_mask = np.uint32(0xFF000000)
+    recolored = {}
+    for size, suits in by_size.items():
+        sources = [images[suit].convert('RGBA') for suit in suits]
+        # Pillow's 'L' conversion is the grey level ImageOps.grayscale uses
+        gray = np.stack([np.asarray(source.convert('L')) for source in sources]).astype(np.uint16)
+        gray += (np.arange(len(suits), dtype=np.uint16) * 256)[:, None, None]
+        packed = np.concatenate([pack_lut(luts[suit]) for suit in suits])
+        out = np.take(packed, gray)
+        for index, (suit, source) in enumerate(zip(suits, sources)):
+            words = out[index]
+            words |= np.asarray(source).view(np.uint32)[..., 0] & alpha_mask
+            recolored[suit] = Image.frombuffer('RGBA', size, words, 'raw', 'RGBA', 0, 1)
+    return recolored
+
+def pack_lut(lut: np.ndarray) -> np.ndarray:
+    """Pack a 256x3 uint8 LUT into little-endian RGBA uint32 words with zero alpha."""
+    lut = lut.astype(np.uint32)
+    return lut[:, 0] | (lut[:, 1] << 8) | (lut[:, 2] << 16)
+
+def extract_suits(images: Dict[str, Image.Image], parameters, raster: PillowBackend = None,
+                  scale: float = None) -> Dict[str, Image.Image]:
+    """Transform transparent PNG suit images: recolour them in one batch, then scale (by 'main suit scale' unless given)"""
+    raster = raster or get_backend()
+    if scale is None:
+        scale = parameters["app_params"]["Design"].get("main suit scale", 1)
+    recolor = parameters["app_params"]["Design"].get("recolor main suit", True)
+
+    print(f"extract_suits: {', '.join(images)}, scale={scale}, recolor={recolor}")
+
+    if recolor:
+        design = parameters["app_params"]["Design"]
+        images = recolor_suits(images, {suit: suit_tone_lut(suit, design) for suit in images})
+
+    # Scale the images
+    if scale != 1:
+        images = {suit: raster.resize(image, tuple(int(dim * scale) for dim in image.size), Image.LANCZOS)
+                  for suit, image in images.items()}
+
+    return images
+
+def extract_suit(image, suit, parameters, raster: PillowBackend = None):
+    """Transform a transparent PNG suit image"""
+    return extract_suits({suit: image}, parameters, raster)[suit]
+
+# Generation keys with a fixed set of values; the first one is the default
+GENERATION_CHOICES = {
+    "output layout": ("cards", "split", "atlas"),
+    "compositor": ("pillow", "numpy"),
+}
+
+
+def generation_choice(parameters, key: str) -> str:
+    """Return a Generation choice from parameters, raising ValueError for unknown values."""
+    choices = GENERATION_CHOICES[key]
+    value = ((parameters or {}).get("app_params", {}).get("Generation") or {}).get(key, choices[0])
+    if value not in choices:
+        raise ValueError(f"Unknown {key}: {value}. Available: {', '.join(choices)}")
+    return value
+
+class RasterSuit:
+    """A recoloured suit image resized on demand with LANCZOS, cached per size ("raster" suit rendering)."""
+
+    def __init__(self, image: Image.Image):
+        self.image = image
+        self._rendered = RenderCache()
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.image.size
+
+    def render(self, size: Tuple[int, int], raster: PillowBackend = None) -> Image.Image:
+        raster = raster or get_backend()
+        size = tuple(size)
+        if size == self.image.size:
+            return self.image
+        return self._rendered.get((size, raster.name), lambda: raster.resize(self.image, size, Image.LANCZOS))
+
 @dataclass
 class CardGeneratorInput:
     input_folder: str
@@ -49,9 +195,11 @@ class CardGeneratorInput:
     back_image: Image.Image = None
     front_image: Image.Image = None
     suit_images: Dict[str, Image.Image] = field(default_factory=dict)
+    suit_shapes: Dict[str, Union['RasterSuit', SuitSDF, VectorSuit]] = field(default_factory=dict)
     font: ImageFont.FreeTypeFont = None
+    parameters: dict = None
     smoothness: float = CardConstants.SMOOTHNESS
-    curve_smoothness: int = 100  # Number of points for Bézier curve interpolation
+    curve_smoothness: int = 100  # Number of points sampled along the fitted suit spline
 
     def validate_input(self) -> bool:
         input_folder_full_path = os.path.abspath(self.input_folder)
@@ -78,100 +226,391 @@ class CardGeneratorInput:
 
         return True
 
-    def initialize_assets(self, parameters):
-        def load_last_image(pattern):
-            images = sorted(glob.glob(os.path.join(self.input_folder, pattern)))
-            return Image.open(images[-1])
-
-        def extract_suit(image, suit, parameters):
-            """Transform a transparent PNG suit image"""
-            scale = parameters["app_params"]["Design"].get("main suit scale", 1)
-            recolor = parameters["app_params"]["Design"].get("recolor main suit", True)
-
-            print(f"extract_suit: {suit}, scale={scale}, recolor={recolor}")
-
-            original_size = image.size
-
-            if recolor:
-                color = CardConstants.RED_COLOR if suit in ['heart', 'diamond'] else CardConstants.BLACK_COLOR
-                # Convert color tuple to RGB
-                rgb_color = tuple(color[:3])  # Take only the RGB values, ignore alpha if present
-                # Create a grayscale version of the image
-                gray_image = ImageOps.grayscale(image)
-                # Colorize the grayscale image
-                colored_image = ImageOps.colorize(gray_image, (0, 0, 0), rgb_color)
-                # Preserve the alpha channel from the original image
-                
-                # FIXME: Set alpha to full opacity if necessary 
-                alpha_channel = image.getchannel('A')
-                colored_image.putalpha(alpha_channel)
-                
-                image = colored_image
-
-            # Scale the image
-            if scale != 1:
-                new_size = tuple(int(dim * scale) for dim in original_size)
-                image = image.resize(new_size, Image.LANCZOS)
-
-            print(f"Original size: {original_size}, New size: {image.size}")
-
-            return image
-
-        self.back_image = load_last_image("im-back*.png").resize(CardConstants.HALF_CARD_SIZE)
-        self.front_image = load_last_image("im-front*.png").resize(CardConstants.HALF_CARD_SIZE)
-        
+    def asset_paths(self) -> Dict[str, str]:
+        """Return the input file used for each asset role (the last match of each pattern)."""
+        def last_file(pattern):
+            files = sorted(glob.glob(os.path.join(self.input_folder, pattern)))
+            return files[-1]
+
+        paths = {"back": last_file("im-back*.png"), "front": last_file("im-front*.png")}
         for suit in CardConstants.SUITS:
-            suit_image = load_last_image(f"suit-{suit}*.png")
-            self.suit_images[suit] = extract_suit(suit_image, suit, parameters)
+            paths[suit] = last_file(f"suit-{suit}*.png")
+        paths["font"] = last_file("*.ttf")
+        return paths
 
-        font_files = sorted(glob.glob(os.path.join(self.input_folder, "*.ttf")))
-        print(f"Available fonts: {', '.join(os.path.basename(f) for f in font_files)}")
-        self.font = ImageFont.truetype(font_files[-1], size=CardConstants.FONT_SIZE)
+    @property
+    def raster(self) -> PillowBackend:
+        """The raster backend selected by Generation 'raster backend' (Pillow by default)."""
+        return get_backend((self.parameters or {}).get("app_params", {}).get("Generation", {}).get("raster backend"))
+
+    def initialize_assets(self, parameters, memo: AssetMemo = None):
+        """Load and prepare the card assets; with a memo, only assets whose source or parameters changed are rebuilt."""
+        self.parameters = parameters
+        paths = self.asset_paths()
+        memo = memo or AssetMemo()
+        design = parameters["app_params"]["Design"]
+        raster = self.raster
+
+        def load_last_image(role):
+            return Image.open(paths[role])
+
+        def load_font():
+            with trace_span("font load"):
+                return load_font_file()
+
+        def load_font_file():
+            font_files = sorted(glob.glob(os.path.join(self.input_folder, "*.ttf")))
+            print(f"Available fonts: {', '.join(os.path.basename(f) for f in font_files)}")
+            return ImageFont.truetype(paths["font"], size=CardConstants.FONT_SIZE)
+
+        # Optional on-disk cache of baked assets, shared by worker processes and later runs
+        cache_folder = parameters["app_params"].get("Generation", {}).get("asset cache folder")
+        baked = BakedAssetCache(cache_folder) if cache_folder else None
+
+        def bake(role, params, build):
+            with trace_span("extract_suit" if role in CardConstants.SUITS else "asset load", role=role):
+                if baked:
+                    return baked.get_image(role, paths[role], params, build)
+                return build()
+
+        for role in ("back", "front"):
+            params = [CardConstants.HALF_CARD_SIZE, raster.name]
+            image = memo.get(role, (file_key(paths[role]), params),
+                             lambda: bake(role, params, lambda: raster.resize(load_last_image(role), CardConstants.HALF_CARD_SIZE, None)))
+            setattr(self, f"{role}_image", image)
+
+        rendering = design.get("suit rendering", "raster")
+        if rendering not in ("raster", "sdf", "vector"):
+            raise ValueError(f"Unknown suit rendering: {rendering}. Available: raster, sdf, vector")
+
+        suit_keys = {}
+        for suit in CardConstants.SUITS:
+            params = [design.get("main suit scale", 1), design.get("recolor main suit", True),
+                      CardConstants.RED_COLOR, CardConstants.BLACK_COLOR,
+                      design.get("recolor tones"), design.get("recolor mode", "gradient"), raster.name, rendering]
+            suit_keys[suit] = (file_key(paths[suit]), params)
+
+        self.suit_shapes = {}
+        self.initialize_suit_shapes(paths, parameters, memo, suit_keys, rendering, bake)
+
+        self.font = memo.get("font", (file_key(paths["font"]), CardConstants.FONT_SIZE), load_font)
+
+    def initialize_suit_shapes(self, paths, parameters, memo: AssetMemo, suit_keys, rendering: str, bake):
+        """Build a scale-independent shape per suit once and rasterize the main suits from it.
+
+        The shape is the recoloured suit image ("raster"), its distance field ("sdf") or
+        its vector path ("vector"); index stamps are rasterized from the same shape, so
+        'main suit scale' only affects the central suit.
+        """
+        raster = self.raster
+        scale = parameters["app_params"]["Design"].get("main suit scale", 1)
+        shape_keys = {suit: (key, params[1:] + [self.smoothness, self.curve_smoothness])
+                      for suit, (key, params) in suit_keys.items()}
+        # Suits whose memo entry is stale are extracted together in one batch on first use
+        stale_suits = [suit for suit in CardConstants.SUITS if not memo.contains(f"{suit} shape", shape_keys[suit])]
+        extracted = {}
+        suit_paths = {}
+
+        def extract(suit):
+            if not extracted:
+                extracted.update(extract_suits({s: Image.open(paths[s]) for s in stale_suits}, parameters, raster, scale=1))
+                if rendering == "vector":
+                    with trace_span("suit paths"):
+                        suit_paths.update(load_suit_paths({s: paths[s] for s in stale_suits},
+                                                          self.smoothness, self.curve_smoothness))
+            return extracted[suit]
+
+        def build_shape(suit):
+            if rendering == "raster":
+                return RasterSuit(bake(suit, shape_keys[suit][1], lambda: extract(suit)))
+            image = extract(suit)
+            if rendering == "vector":
+                return VectorSuit.from_image(suit_paths[suit], image)
+            with trace_span("suit sdf", suit=suit):
+                return SuitSDF.from_image(image)
+
+        def build_main_suit(suit, size):
+            shape = self.suit_shapes[suit]
+            if rendering == "raster" and size == shape.size:
+                return shape.render(size, raster)  # the (baked) recoloured suit itself
+            # The main suit at 'main suit scale' is baked too, so new processes do not resize it again
+            return bake(suit, suit_keys[suit][1], lambda: self.suit_at(suit, size))
+
+        for suit in CardConstants.SUITS:
+            self.suit_shapes[suit] = memo.get(f"{suit} shape", shape_keys[suit], lambda: build_shape(suit))
+            size = tuple(int(dim * scale) for dim in self.suit_shapes[suit].size)
+            self.suit_images[suit] = memo.get(suit, suit_keys[suit], lambda: build_main_suit(suit, size))
+
+    def suit_at(self, suit: str, size: Tuple[int, int]) -> Image.Image:
+        """Return the suit at size, rasterized from its shape (or resized from the main suit image when there is none)."""
+        shape = self.suit_shapes.get(suit)
+        if shape is not None:
+            return shape.render(size, self.raster)
+        return self.raster.resize(self.suit_images[suit], size, Image.LANCZOS)
+
+    def scaled(self, scale: float, previous: 'CardGeneratorInput' = None, stages=ALL_STAGES) -> 'CardGeneratorInput':
+        """Return a copy of the loaded assets resized by scale, for reduced-resolution rendering.
+
+        With previous (an earlier scaled copy), only the assets of the given
+        invalidated stages are resized again; the other prepared assets are taken
+        from previous, everything else (folders, prefix, parameters) from self.
+        """
+        def scaled_size(image):
+            return (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+
+        if previous is None:
+            stages = ALL_STAGES
+        updates = {}
+        for role in ("back", "front"):
+            image = getattr(self, f"{role}_image")
+            updates[f"{role}_image"] = (self.raster.resize(image, scaled_size(image)) if role in stages
+                                        else getattr(previous, f"{role}_image"))
+        if "main suit" in stages:
+            updates["suit_images"] = {suit: self.suit_at(suit, scaled_size(image)) for suit, image in self.suit_images.items()}
+        else:
+            updates["suit_images"] = previous.suit_images
+        updates["font"] = self.font.font_variant(size=max(1, round(self.font.size * scale))) if "font" in stages else previous.font
+        return replace(self, **updates)
+
+    def asset_identity(self) -> Dict[str, list]:
+        """The prepared asset objects of each asset stage (memoized assets keep their identity)."""
+        return {
+            "back": [self.back_image],
+            "front": [self.front_image],
+            "suit shapes": [self.suit_shapes.get(suit) for suit in CardConstants.SUITS],
+            "main suit": [self.suit_images.get(suit) for suit in CardConstants.SUITS],
+            "font": [self.font],
+        }
+
+    def changed_assets(self, other: 'CardGeneratorInput') -> set:
+        """Asset stages whose prepared assets differ from other's (e.g. a source file edited on disk)."""
+        if other is None:
+            return set(ASSET_STAGES)
+        mine, theirs = self.asset_identity(), other.asset_identity()
+        return {stage for stage in ASSET_STAGES if any(a is not b for a, b in zip(mine[stage], theirs[stage]))}
 
 class DeckGen:
     """Initialize class with given parameters or default values."""
-    def __init__(self, parameters=None):
+    def __init__(self, parameters=None, asset_memo: AssetMemo = None):
         self.parameters = parameters or yaml.safe_load(DEFAULT_CONFIG)
         self.input_data = None
         self.generator = None
+        self.asset_memo = asset_memo or AssetMemo()
+        self.preview_generators: Dict[float, 'PokerCardGenerator'] = {}
+        self.loaded_parameters = None  # snapshot of the parameters the generator was built from
+        self.sweep_memo = None  # multi-entry asset memo kept between sweeps
+        self.invalidated = set(ALL_STAGES)  # stages recomputed by the last loadParams
 
     def loadParams(self, parameters):
-        self.parameters = parameters
-        self.input_data = CardGeneratorInput(
-            input_folder=self.parameters["input_folder"],
-            output_folder=self.parameters["output_folder"],
-            prefix_string=self.parameters["prefix_string"],
-            n_card_gen=52  # Default to generating full deck
-        )
-        if self.input_data.validate_input():
-            self.input_data.initialize_assets(self.parameters)
-            self.generator = PokerCardGenerator(self.input_data)
-        else:
-            raise ValueError("Input validation failed. Please check your parameters and try again.")
-
-    def generate_deck(self, stop_callback=None):
+        """Load parameters, recomputing only the asset and layer stages their changes invalidate (see param_graph)."""
+        with trace_span("loadParams"):
+            self.parameters = parameters
+            input_data = CardGeneratorInput(
+                input_folder=self.parameters["input_folder"],
+                output_folder=self.parameters["output_folder"],
+                prefix_string=self.parameters["prefix_string"],
+                n_card_gen=52  # Default to generating full deck
+            )
+            if not input_data.validate_input():
+                raise ValueError("Input validation failed. Please check your parameters and try again.")
+            for key in GENERATION_CHOICES:
+                generation_choice(self.parameters, key)
+            with trace_span("initialize_assets"):
+                input_data.initialize_assets(self.parameters, self.asset_memo)
+
+            previous = self.input_data if self.generator else None
+            stages = invalidated_stages(self.loaded_parameters if self.generator else None, self.parameters)
+            stages = downstream(stages | input_data.changed_assets(previous))
+            self.input_data = input_data
+            if self.generator is None:
+                self.generator = PokerCardGenerator(input_data)
+            else:
+                self.generator.invalidate(input_data, stages)
+                for scale, generator in self.preview_generators.items():
+                    generator.invalidate(input_data.scaled(scale, generator.input_data, stages), stages)
+            self.loaded_parameters = copy.deepcopy(self.parameters)
+            self.invalidated = stages
+
+    def generate_deck(self, stop_callback=None, workers=None, progress_callback=None):
         if not self.generator:
             raise ValueError("Parameters not loaded. Call loadParams() first.")
-        self.generator.generate_cards(stop_callback)
-
-    def preview_card(self, card_number=None):
+        generation = self.parameters["app_params"].get("Generation", {})
+        if self.generator.output_layout() == "atlas":
+            return self.generate_atlas(stop_callback, progress_callback)
+        if workers is None:
+            workers = generation.get("workers", 1)
+        written = self.generator.generate_cards(
+            stop_callback, workers=workers, progress_callback=progress_callback,
+            writer_threads=generation.get("writer threads", 0),
+            max_in_flight=generation.get("max in flight", 4),
+            incremental=generation.get("incremental", True))
+        print(f"All writes flushed: {written} card files in {self.input_data.output_folder}")
+        return written
+
+    def generate_atlas(self, stop_callback=None, progress_callback=None):
+        """Render the deck faces plus one shared back into atlas pages with a JSON UV index.
+
+        Faces are rendered at 'atlas scale' directly into the atlas page buffers;
+        returns the number of files written.
+        """
+        if not self.generator:
+            raise ValueError("Parameters not loaded. Call loadParams() first.")
+        generation = self.parameters["app_params"].get("Generation", {})
+        generator = self.preview_generator(self.preview_scale(generation.get("atlas scale", 0.25)))
+        atlas = DeckAtlas(generator.half_card_size, generation.get("atlas columns", 8), generation.get("atlas rows", 7))
+
+        cards = list(generator.card_sequence())
+        for completed, (card_index, suit, value) in enumerate(cards, start=1):
+            if stop_callback and stop_callback():
+                print("Atlas generation stopped by user")
+                return 0
+            name = os.path.splitext(generator.card_filename(card_index, suit, value))[0]
+            generator.render_face_into(*atlas.cell_origin(name), card_index, suit, value)
+            if progress_callback:
+                progress_callback(completed, len(cards), name)
+
+        page, origin = atlas.cell_origin(f"{self.input_data.prefix_string}_back")
+        page.paste(generator.input_data.back_image, origin)
+
+        written = atlas.save(self.input_data.output_folder, self.input_data.prefix_string)
+        print(f"Atlas written: {', '.join(written)}")
+        return len(written)
+
+    def preview_scale(self, scale=None, size=None) -> float:
+        """Resolve a preview scale from an explicit scale or a (width, height) to fit; never above full size."""
+        if size is not None:
+            scale = min(size[0] / CardConstants.CARD_SIZE[0], size[1] / CardConstants.CARD_SIZE[1])
+        if scale is None or scale >= 1:
+            return 1.0
+        return round(max(scale, 0.01), 3)
+
+    def preview_generator(self, scale: float) -> 'PokerCardGenerator':
+        """Return a generator rendering at the given scale from scaled assets, cached per scale."""
+        if scale == 1.0:
+            return self.generator
+        generator = self.preview_generators.get(scale)
+        if generator is None:
+            if len(self.preview_generators) >= 8:
+                self.preview_generators.clear()
+            generator = PokerCardGenerator(self.input_data.scaled(scale), scale=scale)
+            self.preview_generators[scale] = generator
+        return generator
+
+    def preview_card(self, card_number=None, scale=None, size=None):
+        """Render one card; scale or size (width, height) render the whole layout at reduced resolution."""
         if not self.generator:
             raise ValueError("Parameters not loaded. Call loadParams() first.")
             
         preview_index = card_number if card_number is not None else self.parameters["app_params"]["Design"].get("Preview index", 0)
-        preview_image = self.generator.generate_card_image(preview_index, return_image=True)
+        generator = self.preview_generator(self.preview_scale(scale, size))
+        preview_image = generator.generate_card_image(preview_index, return_image=True)
         if not isinstance(preview_image, Image.Image):
             raise ValueError("Failed to generate preview image")
         return preview_image
 
+    def iter_cards(self, card_ids=None, scale=None, size=None):
+        """Yield (card_id, suit, value, image) for the given card ids without touching the filesystem."""
+        if not self.generator:
+            raise ValueError("Parameters not loaded. Call loadParams() first.")
+        return self.preview_generator(self.preview_scale(scale, size)).iter_cards(card_ids)
+
+    def sweep(self, axes: List[SweepAxis], card_number=None, scale=0.2, workers=None, stop_callback=None) -> Image.Image:
+        """Render one card face for every combination of one or two parameter axes, as a labelled grid.
+
+        Variants load through one asset memo holding an entry per variant, so assets
+        no swept parameter touches are built once and shared (also across sweeps);
+        each variant's reduced-resolution assets start from the first variant's and
+        only re-resize what differs. The faces then render on a thread pool.
+        """
+        if not self.generator:
+            raise ValueError("Parameters not loaded. Call loadParams() first.")
+        if not 1 <= len(axes) <= 2:
+            raise ValueError(f"A sweep takes one or two parameter axes, got {len(axes)}")
+        if card_number is None:
+            card_number = self.parameters["app_params"]["Design"].get("Preview index", 0)
+        suit, value = self.generator.card_identity(card_number)
+        variants = sweep_variants(self.parameters, axes)
+        if self.sweep_memo is None or self.sweep_memo.capacity < len(variants):
+            self.sweep_memo = AssetMemo(capacity=len(variants))
+        scale = self.preview_scale(scale)
+
+        generators = []
+        base = None
+        for _, parameters in variants:
+            if stop_callback and stop_callback():
+                return None
+            variant = DeckGen(parameters, asset_memo=self.sweep_memo)
+            variant.loadParams(parameters)
+            if base is None:
+                base = variant
+                generators.append(variant.preview_generator(scale))
+                continue
+            previous = base.preview_generator(scale)
+            stages = downstream(invalidated_stages(base.parameters, parameters) |
+                                variant.input_data.changed_assets(base.input_data))
+            generator = PokerCardGenerator(variant.input_data.scaled(scale, previous.input_data, stages), scale=scale)
+            generator.share_layers(previous, stages)
+            generators.append(generator)
+
+        print(f"Sweep: {len(variants)} variants of card {card_number} ({value} {suit}) at scale {scale}")
+
+        def render(generator):
+            return generator.render_card(card_number, suit, value, face_only=True)
+
+        # The first variant renders alone so the layers the others share are built once
+        faces = [render(generators[0])]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers or os.cpu_count() or 1) as executor:
+            faces.extend(executor.map(render, generators[1:]))
+        return sweep_grid(faces, [labels for labels, _ in variants], columns=len(axes[0].values))
+
+    def preview_card_progressive(self, card_number=None, scale=None, size=None, coarse_factor=8):
+        """Yield a coarse preview frame first, then the frame at the requested resolution."""
+        final_scale = self.preview_scale(scale, size)
+        coarse_scale = self.preview_scale(final_scale / coarse_factor)
+        if coarse_scale < final_scale:
+            yield self.preview_card(card_number, scale=coarse_scale)
+        yield self.preview_card(card_number, scale=final_scale)
+
 class PokerCardGenerator:
-    def __init__(self, input_data: CardGeneratorInput):
+    def __init__(self, input_data: CardGeneratorInput, scale: float = 1.0):
+        self.input_data = input_data
+        # Layout in output pixels; scale < 1 renders the same layout at reduced resolution
+        self.scale = scale
+        self.half_card_size = (round(CardConstants.HALF_CARD_SIZE[0] * scale), round(CardConstants.HALF_CARD_SIZE[1] * scale))
+        self.card_size = (self.half_card_size[0] * 2, self.half_card_size[1])
+        self.index_margin = round(50 * scale)
+        self.index_atlas: Dict[Tuple[str, str], Tuple[Image.Image, Image.Image]] = {}
+        self.index_atlas_key = None
+        self.suit_bases: Dict[str, Image.Image] = {}
+        self.face_bases: Dict[str, Image.Image] = {}
+        self.tensor_compositor = None
+        self.asset_digests: Dict[tuple, str] = {}  # file_key -> content digest
+        self.raster = input_data.raster
+
+    def invalidate(self, input_data: CardGeneratorInput, stages):
+        """Switch to newly loaded input data, dropping only the cached layers built from invalidated stages."""
         self.input_data = input_data
+        self.raster = input_data.raster
+        if "suit base" in stages:
+            self.suit_bases = {}
+            self.face_bases = {}
+        if "index stamps" in stages:
+            self.index_atlas = {}
+            self.index_atlas_key = None
+        if "card" in stages:
+            self.tensor_compositor = None
+
+    def share_layers(self, other: 'PokerCardGenerator', stages):
+        """Use the cached layers of another generator at the same scale for every layer stage not in stages."""
+        if "suit base" not in stages:
+            self.suit_bases, self.face_bases = other.suit_bases, other.face_bases
+        if "index stamps" not in stages:
+            self.index_atlas, self.index_atlas_key = other.index_atlas, other.index_atlas_key
 
     def create_stacked_value_suit(self, value: str, suit: str, color: str) -> Image.Image:
         # Create a new image with RGBA mode (for transparency)
         img_size = (self.input_data.font.size * 2, self.input_data.font.size * 3)  # Adjust size as needed
-        img = Image.new('RGBA', img_size, (255, 255, 255, 0))
+        img = self.raster.new_canvas('RGBA', img_size, (255, 255, 255, 0))
         draw = ImageDraw.Draw(img)
 
         # Draw the value
@@ -179,81 +618,384 @@ class PokerCardGenerator:
         value_width = value_bbox[2] - value_bbox[0]
         value_height = value_bbox[3] - value_bbox[1]
         value_position = ((img_size[0] - value_width) // 2, 0)
-        draw.text(value_position, value, font=self.input_data.font, fill=color)
+        with trace_span("text rasterize"):
+            draw.text(value_position, value, font=self.input_data.font, fill=color)
 
         # Resize and draw the suit
-        suit_image = self.input_data.suit_images[suit].copy()
-        suit_image = suit_image.resize((value_width, value_width), Image.LANCZOS)
+        suit_image = self.input_data.suit_at(suit, (value_width, value_width))
         suit_position = ((img_size[0] - value_width) // 2, value_height + self.input_data.font.size // 2)
-        img.paste(suit_image, suit_position, suit_image)
+        self.raster.paste(img, suit_image, suit_position)
 
         return img
 
-    def generate_cards(self, stop_callback=None):
-        card_count = 0
-        suit_abbreviations = {'heart': 'H', 'diamond': 'D', 'club': 'C', 'spades': 'S'}
+    def suit_color(self, suit: str) -> Tuple[int, int, int]:
+        return CardConstants.RED_COLOR if suit in ['heart', 'diamond'] else CardConstants.BLACK_COLOR
+
+    def index_stamps(self, value: str, suit: str) -> Tuple[Image.Image, Image.Image]:
+        """Return the cached (upright, rotated) corner index stamps for a value/suit."""
+        font = self.input_data.font
+        atlas_key = (getattr(font, 'path', None), font.size, CardConstants.RED_COLOR, CardConstants.BLACK_COLOR)
+        if atlas_key != self.index_atlas_key:
+            self.index_atlas = {}
+            self.index_atlas_key = atlas_key
+
+        stamps = self.index_atlas.get((value, suit))
+        if stamps is None:
+            with trace_span("index stamp", value=value, suit=suit):
+                stamp = self.create_stacked_value_suit(value, suit, self.suit_color(suit))
+                stamps = (stamp, self.raster.rotate180(stamp))
+            self.index_atlas[(value, suit)] = stamps
+        return stamps
+
+    def build_index_atlas(self):
+        """Pre-render the index stamps for every value/suit of the deck."""
+        for _, suit, value in self.card_sequence():
+            self.index_stamps(value, suit)
+        return self.index_atlas
+
+    def suit_base(self, suit: str) -> Image.Image:
+        """Return the cached card canvas for a suit: front with the central suit, plus the back."""
+        base = self.suit_bases.get(suit)
+        if base is None:
+            with trace_span("suit base", suit=suit):
+                front = self.input_data.front_image.copy()
+
+                # Add the large central suit image
+                suit_image = self.input_data.suit_images[suit]
+                central_suit_size = suit_image.size # get the image size
+                suit_position = ((self.half_card_size[0] - central_suit_size[0]) // 2,
+                                        (self.half_card_size[1] - central_suit_size[1]) // 2)
+                self.raster.paste(front, suit_image, suit_position)
+
+                base = self.raster.new_canvas('RGB', self.card_size)
+                self.raster.paste(base, front, (0, 0), alpha=False)
+                self.raster.paste(base, self.input_data.back_image, (self.half_card_size[0], 0), alpha=False)
+            self.suit_bases[suit] = base
+        return base
+
+    def face_base(self, suit: str) -> Image.Image:
+        """Return the cached front half of a suit base (no back), for face-only outputs."""
+        face = self.face_bases.get(suit)
+        if face is None:
+            face = self.suit_base(suit).crop((0, 0) + self.half_card_size)
+            self.face_bases[suit] = face
+        return face
+
+    def paste_indices(self, target: Image.Image, origin: Tuple[int, int], value: str, suit: str):
+        """Blit the cached corner index stamps of a card onto a face whose top-left is origin."""
+        # Stacked value-suit stamps for top-left and bottom-right (rotated 180 degrees)
+        stacked_image_top, stacked_image_bottom = self.index_stamps(value, suit)
+        x, y = origin
+        margin = self.index_margin
+        self.raster.paste(target, stacked_image_top, (x + margin, y + margin))
+        self.raster.paste(target, stacked_image_bottom, (x + self.half_card_size[0] - margin - stacked_image_bottom.width,
+                                                         y + self.half_card_size[1] - margin - stacked_image_bottom.height))
+
+    def render_face_into(self, target: Image.Image, origin: Tuple[int, int], card_count: int, suit=None, value=None):
+        """Render a card face (front half only) directly into target at origin."""
+        if suit is None or value is None:
+            suit, value = self.card_identity(card_count)
+        face = self.face_base(suit)
+        with trace_span("composite", card=card_count):
+            self.raster.paste(target, face, origin, alpha=False)
+            self.paste_indices(target, origin, value, suit)
 
+    def card_filename(self, card_count: int, suit: str, value: str, suit_abbreviations=None) -> str:
+        if suit_abbreviations is None:
+            suit_abbreviations = {'heart': 'H', 'diamond': 'D', 'club': 'C', 'spades': 'S'}
+        return f"{self.input_data.prefix_string}_{card_count+1:02d}_{value}_{suit_abbreviations[suit]}.png"
+
+    def asset_digest(self, path: str) -> str:
+        """Content digest of an input file, cached per file version."""
+        key = file_key(path)
+        digest = self.asset_digests.get(key)
+        if digest is None:
+            digest = self.asset_digests[key] = file_digest(path)
+        return digest
+
+    def deck_fingerprint(self) -> str:
+        """Fingerprint of everything all card files depend on, from the current parameters.
+
+        Generation params are read on every call, like output_layout and output_levels,
+        so parameters edited in place are picked up; only the input file digests are cached.
+        """
+        # Design keys that feed no stage of the param graph (e.g. "Preview index") do not change the files
+        design = {key: value for key, value in (self.input_data.parameters or {}).get("app_params", {}).get("Design", {}).items()
+                  if PARAM_STAGES.get(("Design", key)) != set()}
+        return fingerprint({
+            "levels": self.output_levels(),
+            "assets": {role: self.asset_digest(path) for role, path in self.input_data.asset_paths().items()},
+            "design": design,
+            "font": [os.path.basename(getattr(self.input_data.font, 'path', '') or ''), self.input_data.font.size],
+            "layout": [self.output_layout(), CardConstants.CARD_SIZE, CardConstants.RED_COLOR, CardConstants.BLACK_COLOR],
+            "backend": [self.raster.name, self.compositor()],
+        })
+
+    def card_fingerprint(self, card_count: int, suit: str, value: str, deck_fingerprint: str = None) -> str:
+        """Fingerprint of everything a card file depends on: input assets, design params, font, backends and card identity.
+
+        Pass deck_fingerprint() when fingerprinting many cards in one pass.
+        """
+        if deck_fingerprint is None:
+            deck_fingerprint = self.deck_fingerprint()
+        return fingerprint([deck_fingerprint, card_count, suit, value])
+
+    def cards_to_render(self, manifest: DeckManifest = None):
+        """Return the (card_count, suit, value) entries whose output is missing or out of date."""
+        cards = list(self.card_sequence())
+        if manifest is None:
+            return cards
+        deck_fingerprint = self.deck_fingerprint()
+        stale = [card for card in cards
+                 if not manifest.is_current(self.card_filename(*card), self.card_fingerprint(*card, deck_fingerprint))]
+        if len(stale) < len(cards):
+            print(f"Skipping {len(cards) - len(stale)} unchanged cards")
+        return stale
+
+    def card_identity(self, card_count: int) -> Tuple[str, str]:
+        """Return the (suit, value) of a card index in deck order."""
+        if not 0 <= card_count < len(CardConstants.SUITS) * len(CardConstants.VALUES):
+            raise ValueError(f"Invalid card index: {card_count}. Must be between 0 and 51.")
+        return CardConstants.SUITS[card_count // 13], CardConstants.VALUES[card_count % 13]
+
+    def iter_cards(self, card_ids=None):
+        """Lazily render cards in memory, yielding (card_id, suit, value, image).
+
+        card_ids is any iterable of card indices (a list, a range...); by default the
+        first n_card_gen cards. Nothing is written to the output folder.
+        """
+        if card_ids is None:
+            card_ids = range(self.input_data.n_card_gen)
+        for card_id in card_ids:
+            suit, value = self.card_identity(card_id)
+            yield card_id, suit, value, self.generate_card_image(card_id, suit=suit, value=value, return_image=True)
+
+    def card_sequence(self):
+        """Yield (card_count, suit, value) for the cards to generate, in deck order."""
+        card_count = 0
         for suit in CardConstants.SUITS:
             for value in CardConstants.VALUES:
                 if card_count >= self.input_data.n_card_gen:
-                    break
+                    return
+                yield card_count, suit, value
+                card_count += 1
+
+    def generate_cards(self, stop_callback=None, workers=1, progress_callback=None, writer_threads=0, max_in_flight=4,
+                       incremental=False):
+        """Generate the deck and return the number of card files written.
+
+        With workers > 1 the cards are spread over a pool of worker processes. With
+        writer_threads > 0 PNG encoding and writing run on background CardWriter
+        threads while the next card is composited. Every written file is recorded in
+        the output folder's DeckManifest; with incremental, cards whose inputs and
+        file are unchanged are skipped.
+        progress_callback(completed, total, filename) is called once per written card.
+        """
+        # The manifest is always kept up to date; incremental only decides whether it is used to skip cards
+        manifest = DeckManifest(self.input_data.output_folder)
+        cards = self.cards_to_render(manifest if incremental else None)
+        deck_fingerprint = self.deck_fingerprint()
+        fingerprints = {self.card_filename(*card): self.card_fingerprint(*card, deck_fingerprint) for card in cards}
+
+        back = None
+        if self.output_layout() == "split":
+            self.write_shared_back(manifest, skip_current=incremental)
+            back = self.back_filename()
+
+        levels = [subfolder for subfolder, _ in self.output_levels()]
+
+        def card_written(completed, filename):
+            manifest.record(filename, fingerprints[filename], back=back, levels=levels)
+            if progress_callback:
+                progress_callback(completed, len(cards), filename)
+
+        if workers and workers > 1:
+            return self.generate_cards_parallel(cards, stop_callback, workers, card_written)
 
+        card_count = 0
+        suit_abbreviations = {'heart': 'H', 'diamond': 'D', 'club': 'C', 'spades': 'S'}
+        self.build_index_atlas()
+
+        writer = None
+        if writer_threads and writer_threads > 0:
+            writer = CardWriter(self.input_data.output_folder, writer_threads, max_in_flight, card_written)
+
+        try:
+            for (card_index, suit, value), canvas in self.render_cards(cards, face_only=back is not None):
                 if stop_callback and stop_callback():
                     print("Card generation stopped by user")
-                    return
-
-                self.generate_card_image(card_count, suit_abbreviations, suit, value)
-                card_count += 1
+                    break
 
-            if card_count >= self.input_data.n_card_gen:
-                break
+                filename = self.card_filename(card_index, suit, value, suit_abbreviations)
+                self.write_card(canvas, filename, writer)
+                if not writer:
+                    card_count += 1
+                    card_written(card_count, filename)
+        finally:
+            if writer:
+                card_count = writer.close()
 
         print(f"Generated {card_count} cards.")
+        return card_count
+
+    def generate_cards_parallel(self, cards, stop_callback=None, workers=2, card_written=None):
+        """Render the given (card_count, suit, value) cards across worker processes.
+
+        Each worker loads its own assets once through the pool initializer, so only
+        card indices and filenames cross the process boundary.
+        card_written(completed, filename) is called in this process for each finished card.
+        """
+        input_data = self.input_data
+        init_args = (input_data.input_folder, input_data.output_folder, input_data.prefix_string,
+                     input_data.n_card_gen, input_data.parameters)
+        card_count = 0
+
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_card_worker, initargs=init_args)
+        try:
+            # Keep only a small window of cards queued so stop_callback takes effect promptly
+            card_indices = iter([card_index for card_index, _, _ in cards])
+            pending = set()
+            stopped = False
+            while True:
+                if not stopped and stop_callback and stop_callback():
+                    print("Card generation stopped by user")
+                    stopped = True
+                    # Cards already handed to a worker still finish writing
+                    for future in pending:
+                        future.cancel()
+                    pending = {future for future in pending if not future.cancelled()}
+                    card_indices = iter(())
+                for card_index in card_indices:
+                    pending.add(executor.submit(_generate_card_worker, card_index))
+                    if len(pending) >= workers * 2:
+                        break
+                if not pending:
+                    break
+                done, pending = concurrent.futures.wait(
+                    pending, timeout=0.1, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    filename = future.result()
+                    card_count += 1
+                    if card_written:
+                        card_written(card_count, filename)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
-    def generate_card_image(self, card_count, suit_abbreviations=None, suit=None, value=None, return_image=False):
+        print(f"Generated {card_count} cards using {workers} workers.")
+        return card_count
+
+    def generate_card_image(self, card_count, suit_abbreviations=None, suit=None, value=None, return_image=False, writer=None):
 
         if suit_abbreviations is None:
             suit_abbreviations = {'heart': 'H', 'diamond': 'D', 'club': 'C', 'spades': 'S'}
         
         if suit is None or value is None:
-            suit_index = card_count // 13
-            value_index = card_count % 13
-            suit = CardConstants.SUITS[suit_index]
-            value = CardConstants.VALUES[value_index]
-
-        canvas = Image.new('RGB', CardConstants.CARD_SIZE)
-        front = self.input_data.front_image.copy()
-                
-        color = CardConstants.RED_COLOR if suit in ['heart', 'diamond'] else CardConstants.BLACK_COLOR
-                
-        # Create stacked value-suit for top-left
-        stacked_image_top = self.create_stacked_value_suit(value, suit, color)
-        front.paste(stacked_image_top, (50, 50), stacked_image_top)
-                
-        # Create stacked value-suit for bottom-right (rotated 180 degrees)
-        stacked_image_bottom = self.create_stacked_value_suit(value, suit, color)
-        stacked_image_bottom = stacked_image_bottom.rotate(180)
-        front.paste(stacked_image_bottom, (1198 - stacked_image_bottom.width, 1822 - stacked_image_bottom.height), stacked_image_bottom)
-
-        # Add the large central suit image
-        suit_image = self.input_data.suit_images[suit].copy()
-        central_suit_size = suit_image.size # get the image size
-        suit_position = ((CardConstants.HALF_CARD_SIZE[0] - central_suit_size[0]) // 2,
-                                (CardConstants.HALF_CARD_SIZE[1] - central_suit_size[1]) // 2)
-        front.paste(suit_image, suit_position, suit_image)
-
-        canvas.paste(front, (0, 0))
-        canvas.paste(self.input_data.back_image, (1248, 0))
+            suit, value = self.card_identity(card_count)
+
+        # The split layout writes the front half only; previews always show front and back.
+        # render_cards applies the configured compositor, so worker processes render like the serial path
+        face_only = not return_image and self.output_layout() == "split"
+        _, canvas = next(self.render_cards([(card_count, suit, value)], face_only=face_only))
 
         if return_image:
-            return canvas.copy()
+            return canvas
 
         # New naming convention
-        suit_abbr = suit_abbreviations[suit]
-        filename = f"{self.input_data.prefix_string}_{card_count+1:02d}_{value}_{suit_abbr}.png"
-        canvas.save(os.path.join(self.input_data.output_folder, filename))
+        filename = self.card_filename(card_count, suit, value, suit_abbreviations)
+        self.write_card(canvas, filename, writer)
+        return filename
+
+    def render_card(self, card_count: int, suit: str, value: str, face_only: bool = False) -> Image.Image:
+        """Composite one card (or only its front half) on a copy of the cached suit base."""
+        base = self.face_base(suit) if face_only else self.suit_base(suit)
+        self.index_stamps(value, suit)
+
+        with trace_span("composite", card=card_count):
+            canvas = base.copy()
+            self.paste_indices(canvas, (0, 0), value, suit)
+        return canvas
+
+    def render_cards(self, cards, face_only: bool = False):
+        """Lazily yield ((card_count, suit, value), canvas) with the configured 'compositor' backend.
+
+        'pillow' composites card by card; 'numpy' renders each suit's cards as one
+        batched TensorCompositor array.
+        """
+        if self.compositor() == "numpy":
+            if self.tensor_compositor is None:
+                self.tensor_compositor = TensorCompositor(self)
+            yield from self.tensor_compositor.render_cards(cards, with_back=not face_only)
+            return
+        for card in cards:
+            yield card, self.render_card(*card, face_only=face_only)
+
+    def generation_params(self) -> dict:
+        return (self.input_data.parameters or {}).get("app_params", {}).get("Generation", {})
+
+    def output_layout(self) -> str:
+        """'cards' writes front and back side by side per card; 'split' writes fronts plus one shared back;
+        'atlas' packs the faces and the back into atlas pages (DeckGen.generate_atlas)."""
+        return generation_choice(self.input_data.parameters, "output layout")
+
+    def compositor(self) -> str:
+        """The 'compositor' backend used by render_cards ("pillow" by default)."""
+        return generation_choice(self.input_data.parameters, "compositor")
+
+    def output_levels(self, size: Tuple[int, int] = None) -> List[Tuple[str, Tuple[int, int]]]:
+        """Return (subfolder, size) for the full-size output plus each 'pyramid scales' level, largest first."""
+        if size is None:
+            size = self.half_card_size if self.output_layout() == "split" else self.card_size
+        levels = [("", size)]
+        for scale in sorted(set(self.generation_params().get("pyramid scales") or []), reverse=True):
+            if 0 < scale < 1:
+                level_size = (round(size[0] * scale), round(size[1] * scale))
+                levels.append((f"{level_size[0]}x{level_size[1]}", level_size))
+        return levels
+
+    def back_filename(self) -> str:
+        return f"{self.input_data.prefix_string}_back.png"
+
+    def write_shared_back(self, manifest: DeckManifest = None, skip_current: bool = True):
+        """Write the deck's single back image for the split layout, unless the manifest shows it is current."""
+        filename = self.back_filename()
+        back_fingerprint = fingerprint([self.card_fingerprint(0, "back", "back"), "back"])
+        if manifest and skip_current and manifest.is_current(filename, back_fingerprint):
+            return
+        levels = self.output_levels(self.half_card_size)
+        write_card_outputs(self.input_data.back_image, self.input_data.output_folder, filename, levels)
+        print(f"Generated: {filename}")
+        if manifest:
+            manifest.record(filename, back_fingerprint, levels=[subfolder for subfolder, _ in levels])
+
+    def write_card(self, canvas: Image.Image, filename: str, writer: CardWriter = None):
+        """Write a finished card at every output level, on the writer threads when given."""
+        levels = self.output_levels()
+        if writer:
+            writer.submit(canvas, filename, levels)
+            return
+
+        write_card_outputs(canvas, self.input_data.output_folder, filename, levels)
         print(f"Generated: {filename}")
 
+# Per-process generator used by PokerCardGenerator.generate_cards_parallel
+_worker_generator = None
+
+def _init_card_worker(input_folder, output_folder, prefix_string, n_card_gen, parameters):
+    """Process pool initializer: load the card assets once per worker."""
+    global _worker_generator
+    input_data = CardGeneratorInput(
+        input_folder=input_folder,
+        output_folder=output_folder,
+        prefix_string=prefix_string,
+        n_card_gen=n_card_gen
+    )
+    input_data.initialize_assets(parameters)
+    _worker_generator = PokerCardGenerator(input_data)
+
+def _generate_card_worker(card_count):
+    return _worker_generator.generate_card_image(card_count)
+
 # used to get the image module
 def get_image_module():
     return Image
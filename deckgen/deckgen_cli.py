@@ -0,0 +1,253 @@
+import os
+import sys
+import time
+import argparse
+import concurrent.futures
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+import yaml
+
+from asset_cache import AssetMemo
+from deck_trace import TRACER
+from deck_atlas import ATLAS_INDEX_SUFFIX
+from deck_manifest import DeckManifest
+from deckgen import DeckGen
+from param_sweep import SweepAxis, parse_axis
+
+STAGES = ["load", "render", "write"]
+
+
+@dataclass
+class CardTask:
+    config_index: int
+    card_index: int
+    filename: str
+    fingerprint: str = None
+    atlas: bool = False  # the whole deck rendered into atlas pages by DeckGen.generate_atlas
+
+
+@dataclass
+class BatchSummary:
+    decks: int = 0
+    cards: int = 0
+    skipped: int = 0
+    wall_time: float = 0.0
+    stage_times: Dict[str, float] = field(default_factory=lambda: {stage: 0.0 for stage in STAGES})
+
+    def add(self, timings: Dict[str, float]):
+        self.cards += 1
+        for stage, seconds in timings.items():
+            self.stage_times[stage] += seconds
+
+    def report(self) -> str:
+        throughput = self.cards / self.wall_time if self.wall_time else 0.0
+        lines = [
+            f"Decks: {self.decks}  cards written: {self.cards}  skipped: {self.skipped}",
+            f"Wall time: {self.wall_time:.2f}s  throughput: {throughput:.2f} cards/s",
+            f"{'stage':<8}{'total s':>10}{'mean ms':>10}",
+        ]
+        for stage in STAGES:
+            total = self.stage_times[stage]
+            mean_ms = 1000 * total / self.cards if self.cards else 0.0
+            lines.append(f"{stage:<8}{total:>10.2f}{mean_ms:>10.1f}")
+        return "\n".join(lines)
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse an 'i/N' shard spec (0 <= i < N)."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid shard '{value}', expected i/N")
+    if count < 1 or not 0 <= index < count:
+        raise argparse.ArgumentTypeError(f"Invalid shard '{value}', need 0 <= i < N")
+    return index, count
+
+
+def parse_sweep(value: str) -> SweepAxis:
+    """Parse a 'key=start:stop:count' or 'key=v1,v2,...' sweep axis."""
+    try:
+        return parse_axis(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def load_config(path: str, asset_cache: str = None) -> dict:
+    with open(path, 'r') as f:
+        parameters = yaml.safe_load(f)
+    if asset_cache:
+        parameters.setdefault("app_params", {}).setdefault("Generation", {})["asset cache folder"] = asset_cache
+    return parameters
+
+
+class BatchRenderer:
+    """Loads deck configs on demand, sharing an AssetMemo per input folder."""
+
+    def __init__(self, configs: List[dict]):
+        self.configs = configs
+        self.decks: Dict[int, DeckGen] = {}
+        self.memos: Dict[str, AssetMemo] = {}
+
+    def deck(self, config_index: int) -> DeckGen:
+        deck = self.decks.get(config_index)
+        if deck is None:
+            parameters = self.configs[config_index]
+            memo = self.memos.setdefault(os.path.abspath(parameters["input_folder"]), AssetMemo())
+            deck = DeckGen(parameters, asset_memo=memo)
+            deck.loadParams(parameters)
+            self.decks[config_index] = deck
+        return deck
+
+    def render(self, task: CardTask) -> Dict[str, float]:
+        start = time.perf_counter()
+        deck = self.deck(task.config_index)
+        generator = deck.generator
+        loaded = time.perf_counter()
+        if task.atlas:
+            # Faces are rendered straight into the atlas pages; encoding is part of the same call
+            deck.generate_atlas()
+            return {"load": loaded - start, "render": time.perf_counter() - loaded, "write": 0.0}
+        suit, value = generator.card_identity(task.card_index)
+        # The split layout writes only the front half; the shared back is written once per deck
+        _, canvas = next(generator.render_cards([(task.card_index, suit, value)],
+                                                face_only=generator.output_layout() == "split"))
+        rendered = time.perf_counter()
+        generator.write_card(canvas, task.filename)
+        written = time.perf_counter()
+        return {"load": loaded - start, "render": rendered - loaded, "write": written - rendered}
+
+
+# Per-process renderer used by the worker pool
+_worker_renderer = None
+
+def _init_batch_worker(configs):
+    global _worker_renderer
+    _worker_renderer = BatchRenderer(configs)
+
+def _render_batch_task(task: CardTask):
+    return task, _worker_renderer.render(task)
+
+
+def plan_tasks(renderer: BatchRenderer, shard: Tuple[int, int], incremental: bool) -> Tuple[List[CardTask], Dict[int, DeckManifest], int]:
+    """List this shard's cards that need rendering.
+
+    The shard is taken from the full (deck, card) order before skipping unchanged
+    cards, so every machine agrees on the split whatever its local output state.
+    A deck with the atlas layout is a single task: its pages are written together.
+    """
+    shard_index, shard_count = shard
+    tasks, manifests, skipped = [], {}, 0
+    position = 0
+    for config_index in range(len(renderer.configs)):
+        generator = renderer.deck(config_index).generator
+        if generator.output_layout() == "atlas":
+            position += 1
+            if (position - 1) % shard_count == shard_index:
+                tasks.append(CardTask(config_index, -1, generator.input_data.prefix_string + ATLAS_INDEX_SUFFIX, atlas=True))
+            continue
+        manifest = DeckManifest(generator.input_data.output_folder)
+        manifests[config_index] = manifest
+        if generator.output_layout() == "split":
+            generator.write_shared_back(manifest, skip_current=incremental)
+        deck_fingerprint = generator.deck_fingerprint()
+        for card in generator.card_sequence():
+            position += 1
+            if (position - 1) % shard_count != shard_index:
+                continue
+            filename = generator.card_filename(*card)
+            fingerprint = generator.card_fingerprint(*card, deck_fingerprint)
+            if incremental and manifest.is_current(filename, fingerprint):
+                skipped += 1
+                continue
+            tasks.append(CardTask(config_index, card[0], filename, fingerprint))
+    return tasks, manifests, skipped
+
+
+def run_batch(config_paths: List[str], workers: int = 1, shard: Tuple[int, int] = (0, 1),
+              asset_cache: str = None, incremental: bool = True) -> BatchSummary:
+    configs = [load_config(path, asset_cache) for path in config_paths]
+    summary = BatchSummary(decks=len(configs))
+    start = time.perf_counter()
+
+    renderer = BatchRenderer(configs)
+    tasks, manifests, summary.skipped = plan_tasks(renderer, shard, incremental)
+    print(f"Shard {shard[0]}/{shard[1]}: {len(tasks)} cards to render from {len(configs)} decks, {summary.skipped} unchanged")
+
+    def finished(task: CardTask, timings: Dict[str, float]):
+        summary.add(timings)
+        if task.atlas:
+            return
+        generator = renderer.deck(task.config_index).generator
+        back = generator.back_filename() if generator.output_layout() == "split" else None
+        levels = [subfolder for subfolder, _ in generator.output_levels()]
+        manifests[task.config_index].record(task.filename, task.fingerprint, back=back, levels=levels)
+
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_batch_worker, initargs=(configs,)) as executor:
+            for task, timings in executor.map(_render_batch_task, tasks):
+                finished(task, timings)
+    else:
+        for task in tasks:
+            finished(task, renderer.render(task))
+
+    summary.wall_time = time.perf_counter() - start
+    return summary
+
+
+def run_sweeps(config_paths: List[str], axes: List[SweepAxis], card_number: int = None, scale: float = 0.2,
+               workers: int = 1, asset_cache: str = None) -> List[str]:
+    """Render a parameter sweep grid per config into its output folder; return the written paths."""
+    written = []
+    for path in config_paths:
+        parameters = load_config(path, asset_cache)
+        deckgen = DeckGen()
+        deckgen.loadParams(parameters)
+        grid = deckgen.sweep(axes, card_number, scale, workers)
+        sweep_path = os.path.join(parameters["output_folder"], f"{parameters['prefix_string']}_sweep.png")
+        grid.save(sweep_path)
+        print(f"Sweep grid written to {sweep_path}")
+        written.append(sweep_path)
+    return written
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render poker decks from deckgen YAML configs without the GUI.")
+    parser.add_argument("configs", nargs="+", help="deck config YAML files, as written by the GUI 'save' action")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes (default: CPU count)")
+    parser.add_argument("--shard", type=parse_shard, default=(0, 1), metavar="i/N",
+                        help="render only every N-th card starting at i, to split a batch across machines")
+    parser.add_argument("--asset-cache", default=None,
+                        help="baked asset cache folder shared by all workers (see 'asset cache folder')")
+    parser.add_argument("--trace", default=None, metavar="PATH",
+                        help="record pipeline stage spans (this process only) and write a Chrome/Perfetto trace JSON")
+    parser.add_argument("--profile", default=None, metavar="PATH", help="run under cProfile and dump the stats to PATH")
+    parser.add_argument("--no-incremental", dest="incremental", action="store_false",
+                        help="re-render every card even if its manifest entry is current")
+    parser.add_argument("--sweep", type=parse_sweep, action="append", metavar="KEY=VALUES",
+                        help="instead of the deck, render one card for every value of KEY as a labelled grid "
+                             "(given twice: every combination), e.g. 'main suit scale=0.6:1.2:4' or 'recolor mode=gradient,steps'")
+    parser.add_argument("--sweep-card", type=int, default=None, help="card index for --sweep (default: the config's Preview index)")
+    parser.add_argument("--sweep-scale", type=float, default=0.2, help="render scale of the sweep cells (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    if args.sweep:
+        if len(args.sweep) > 2:
+            parser.error("--sweep takes at most two parameters")
+        run_sweeps(args.configs, args.sweep, args.sweep_card, args.sweep_scale, args.workers, args.asset_cache)
+        return 0
+
+    if args.trace:
+        TRACER.enable()
+    with TRACER.profile(args.profile):
+        summary = run_batch(args.configs, args.workers, args.shard, args.asset_cache, args.incremental)
+    print(summary.report())
+    if args.trace:
+        TRACER.export_chrome_trace(args.trace)
+        print(TRACER.summary_table())
+        print(f"Trace written to {args.trace}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,20 +4,42 @@ from tkinter import scrolledtext, filedialog, messagebox
 from ttkbootstrap.tooltip import ToolTip
 from dataclasses import dataclass, asdict, field
 import json
+import copy
+import time
 from typing import Dict, Any
 import os
 from PIL import Image, ImageTk
-from deckgen import DeckGen, get_image_module
+from deckgen import CardConstants, DeckGen, get_image_module
 import yaml
 import traceback
 
 from deckgen import DeckGen  # Import the DeckGen class we just created
+from render_worker import RenderWorker
+from preview_pyramid import PreviewPyramid
+from contact_sheet import ContactSheet
+from param_sweep import parse_axis
 
 class DeckGenGui:
+    POLL_MS = 50  # how often worker results are picked up on the Tk thread
+    THUMBNAIL_SIZE = (160, 120)
+    THUMBNAIL_INTERVAL = 0.25  # seconds between progress thumbnails
+    RESIZE_SETTLE_MS = 150  # preview resize idle time before the full-quality frame
+
     def __init__(self, master):
         self.master = master
-        self.deckgen = DeckGen()  # Create an instance of DeckGen
+        self.deckgen = DeckGen()  # renders previews on the render worker; the startup config is loaded before it runs
+        # The form's parameters, owned by the Tk thread; the worker only ever receives deep copies
+        self.parameters = copy.deepcopy(self.deckgen.parameters)
+        self.generation_deckgen = DeckGen(asset_memo=self.deckgen.asset_memo)  # keeps its cached layers between runs
+        # Previews may run between sheet cells and reload self.deckgen, so sheets render from their own DeckGen
+        self.sheet_deckgen = DeckGen(asset_memo=self.deckgen.asset_memo)
         self.preview_window = None  # store preview window reference
+        self.worker = RenderWorker()  # previews and generation run off the Tk thread
+        self.contact_sheet = ContactSheet()  # keeps the thumbnails of unchanged cards between sheets
+        self.sheet_window = None
+        self.sheet_canvas = None
+        self.sheet_photos = []
+        self.sweep_window = None
 
         self.style = ttk.Style(theme="darkly")  # "darkly" or "cosmo"
         master.title("Deck Generator")
@@ -59,6 +81,8 @@ class DeckGenGui:
         # load configuration and initialize GUI
         self.load_startup_config()
         self.update_gui_from_app()
+
+        self.master.after(self.POLL_MS, self.poll_worker)
     
     def create_sections(self):
         sections = [
@@ -103,7 +127,8 @@ class DeckGenGui:
     def create_actions_section(self, parent):
         actions = [
             ("Parameters", [("load", self.load_parameters), ("save", self.save_parameters)]),
-            ("Deck", [("preview", self.preview_deck), ("generate", self.generate_deck)])
+            ("Deck", [("preview", self.preview_deck), ("sheet", self.preview_sheet), ("generate", self.generate_deck),
+                      ("stop", self.stop_generation)])
         ]
         for i, (label, buttons) in enumerate(actions):
             ttk.Label(parent, text=label).grid(row=i, column=0, sticky="w")
@@ -111,10 +136,30 @@ class DeckGenGui:
                 button = ttk.Button(parent, text=text, command=command)
                 button.grid(row=i, column=j+1, padx=(5, 0), sticky="w", pady=2)
                 ToolTip(button, text=f"{text.capitalize()} {label.lower()}")
+
+        # Parameter sweep: one or two axes rendered side by side for the preview card
+        row = len(actions)
+        ttk.Label(parent, text="Sweep").grid(row=row, column=0, sticky="w")
+        self.sweep_entry = ttk.Entry(parent)
+        self.sweep_entry.grid(row=row, column=1, columnspan=3, sticky="ew", padx=(5, 0), pady=2)
+        ToolTip(self.sweep_entry, text="One or two sweeps separated by ';', e.g. "
+                                       "'main suit scale=0.6:1.2:4; recolor mode=gradient,steps'")
+        button = ttk.Button(parent, text="sweep", command=self.preview_sweep)
+        button.grid(row=row, column=4, padx=(5, 0), sticky="w", pady=2)
+        ToolTip(button, text="Render the preview card for every swept value")
+
+        # Generation progress: bar, last written card and its thumbnail
+        self.progress_bar = ttk.Progressbar(parent, mode='determinate')
+        self.progress_bar.grid(row=row + 1, column=0, columnspan=5, sticky="ew", pady=(5, 0))
+        self.progress_label = ttk.Label(parent, text="")
+        self.progress_label.grid(row=row + 2, column=0, columnspan=4, sticky="w")
+        self.thumbnail_label = ttk.Label(parent)
+        self.thumbnail_label.grid(row=row + 2, column=4, sticky="e")
         parent.grid_columnconfigure(0, weight=0)
         parent.grid_columnconfigure(1, weight=0)
         parent.grid_columnconfigure(2, weight=0)
-        parent.grid_columnconfigure(3, weight=1)
+        parent.grid_columnconfigure(3, weight=0)
+        parent.grid_columnconfigure(4, weight=1)
 
     def create_log_section(self, parent):
         self.log_text = scrolledtext.ScrolledText(parent, wrap=tk.WORD, height=10)
@@ -145,7 +190,8 @@ class DeckGenGui:
             try:
                 with open(file_path, 'r') as f:
                     data = yaml.safe_load(f)
-                self.deckgen.loadParams(data)
+                # Assets are (re)loaded by the render worker on the next preview or generation
+                self.parameters = data
                 self.update_gui_from_app()
                 self.log("Parameters loaded successfully")
             except Exception as e:
@@ -162,16 +208,28 @@ class DeckGenGui:
         if file_path:
             try:
                 with open(file_path, 'w') as f:
-                    yaml.dump(self.deckgen.parameters, f, default_flow_style=False)
+                    yaml.dump(self.parameters, f, default_flow_style=False)
                 self.log(f"Parameters saved successfully to {file_path}")
             except Exception as e:
                 self.log(f"Error saving parameters: {str(e)}", 'error', e)
 
     def preview_deck(self):
+        params = self.update_deckgen_params()
+        if params is None:
+            return
+        # The preview window never exceeds the screen, so render at most at screen resolution
+        size = (self.master.winfo_screenwidth(), self.master.winfo_screenheight())
+        self.worker.submit(RenderWorker.PREVIEW, lambda worker: self.render_preview(params, size),
+                           lambda preview_card: self.show_preview(preview_card, params),
+                           lambda e: self.log(f"Error generating preview: {str(e)}", 'error'))
+
+    def render_preview(self, params, size):
+        """Worker thread: reload the parameters and render the preview card."""
+        self.deckgen.loadParams(params)
+        return self.deckgen.preview_card(size=size)
+
+    def show_preview(self, preview_card, params):
         try:
-            self.update_deckgen_params()
-            preview_card = self.deckgen.preview_card()
-
             # Ensure we're using the correct Image module
             Image = get_image_module()
 
@@ -194,29 +252,32 @@ class DeckGenGui:
             frame = ttk.Frame(self.preview_window)
             frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
 
-            # Function to resize and display the image
-            def resize_image(event):
-                # Get the current size of the frame
-                width = event.width
-                height = event.height
-
-                # Calculate the scaling factor while maintaining aspect ratio
-                aspect_ratio = preview_card.width / preview_card.height
-                if width / height > aspect_ratio:
-                    new_width = int(height * aspect_ratio)
-                    new_height = height
-                else:
-                    new_width = width
-                    new_height = int(width / aspect_ratio)
-
-                # Resize the image
-                resized_image = preview_card.resize((new_width, new_height), Image.LANCZOS)
-                photo = ImageTk.PhotoImage(resized_image)
-
-                # Update the image in the label
+            # Precompute a mip pyramid: drags show a fast draft, one LANCZOS frame is rendered once they settle
+            pyramid = PreviewPyramid(preview_card)
+            settle = {"job": None}
+
+            def show(photo):
                 label.config(image=photo)
                 label.image = photo  # Keep a reference
 
+            def show_final(size):
+                settle["job"] = None
+                show(pyramid.frame(size, ImageTk.PhotoImage))
+
+            # Function to resize and display the image
+            def resize_image(event):
+                size = pyramid.fit((event.width, event.height))
+                if settle["job"]:
+                    frame.after_cancel(settle["job"])
+                    settle["job"] = None
+
+                cached = pyramid.cached_frame(size)
+                if cached is not None:
+                    show(cached)
+                    return
+                show(ImageTk.PhotoImage(pyramid.draft(size)))
+                settle["job"] = frame.after(self.RESIZE_SETTLE_MS, show_final, size)
+
             # Create a label to display the image
             label = ttk.Label(frame)
             label.pack(fill=tk.BOTH, expand=True)
@@ -224,17 +285,156 @@ class DeckGenGui:
             # Bind the resize event
             frame.bind("<Configure>", resize_image)
 
-            self.log(f"Deck preview generated for {self.deckgen.parameters['prefix_string']}")
+            self.log(f"Deck preview generated for {params['prefix_string']}")
         except Exception as e:
             self.log(f"Error generating preview: {str(e)}", 'error', e)
 
-    def generate_deck(self):
+    def preview_sheet(self):
+        params = self.update_deckgen_params()
+        if params is None:
+            return
+        self.worker.submit(RenderWorker.SHEET, lambda worker: self.render_sheet(params),
+                           self.sheet_done, lambda e: self.log(f"Error generating contact sheet: {str(e)}", 'error'))
+
+    def render_sheet(self, params):
+        """Worker thread: render every card at thumbnail resolution, posting each cell as it completes."""
+        deckgen = self.sheet_deckgen
+        deckgen.loadParams(params)
+        self.worker.post(self.open_sheet_window, self.contact_sheet.sheet_size(
+            deckgen.preview_generator(deckgen.preview_scale(self.contact_sheet.scale)).half_card_size,
+            len(CardConstants.VALUES), len(CardConstants.SUITS)))
+        self.contact_sheet.render(deckgen, os.cpu_count() or 1,
+                                  on_cell=lambda card_id, image, origin: self.worker.post(self.show_sheet_cell, image, origin),
+                                  stop_callback=self.worker.should_stop)
+        return self.contact_sheet.rendered, self.contact_sheet.reused
+
+    def open_sheet_window(self, size):
+        if self.sheet_window and self.sheet_window.winfo_exists():
+            self.sheet_canvas.delete("all")
+            self.sheet_canvas.configure(width=size[0], height=size[1])
+        else:
+            self.sheet_window = tk.Toplevel(self.master)
+            self.sheet_window.title("Contact Sheet")
+            self.sheet_canvas = tk.Canvas(self.sheet_window, width=size[0], height=size[1], highlightthickness=0,
+                                          background="#202020")
+            self.sheet_canvas.pack(fill=tk.BOTH, expand=True)
+        self.sheet_photos = []  # Keep references to the cell images
+
+    def show_sheet_cell(self, image, origin):
+        if not (self.sheet_window and self.sheet_window.winfo_exists()):
+            return
+        photo = ImageTk.PhotoImage(image)
+        self.sheet_canvas.create_image(origin[0], origin[1], image=photo, anchor=tk.NW)
+        self.sheet_photos.append(photo)
+
+    def sheet_done(self, counts):
+        rendered, reused = counts
+        self.log(f"Contact sheet: {rendered} cards rendered, {reused} unchanged cards reused")
+
+    def preview_sweep(self):
         try:
-            self.update_deckgen_params()
-            self.deckgen.generate_deck()
-            self.log(f"Deck generated {self.deckgen.parameters['prefix_string']} into {self.deckgen.parameters['output_folder']}", 'exec')
-        except Exception as e:
-            self.log(f"Error generating deck: {str(e)}", 'error', e)
+            axes = [parse_axis(spec) for spec in self.sweep_entry.get().split(";") if spec.strip()]
+        except ValueError as e:
+            self.log(str(e), 'error')
+            return
+        if not 1 <= len(axes) <= 2:
+            self.log("Enter one or two sweeps, e.g. 'main suit scale=0.6:1.2:4'", 'warning')
+            return
+        params = self.update_deckgen_params()
+        if params is None:
+            return
+        # Same priority as contact sheets (both render from sheet_deckgen), but a sweep never replaces a queued sheet
+        self.worker.submit(RenderWorker.SHEET, lambda worker: self.render_sweep(params, axes),
+                           self.show_sweep, lambda e: self.log(f"Error rendering sweep: {str(e)}", 'error'), kind="sweep")
+
+    def render_sweep(self, params, axes):
+        """Worker thread: reload the parameters and render the sweep grid."""
+        self.sheet_deckgen.loadParams(params)
+        return self.sheet_deckgen.sweep(axes, stop_callback=self.worker.should_stop)
+
+    def show_sweep(self, grid):
+        if grid is None:
+            self.log("Sweep stopped")
+            return
+        if self.sweep_window and self.sweep_window.winfo_exists():
+            self.sweep_window.destroy()
+        self.sweep_window = tk.Toplevel(self.master)
+        self.sweep_window.title("Parameter Sweep")
+        photo = ImageTk.PhotoImage(grid)
+        label = ttk.Label(self.sweep_window, image=photo)
+        label.image = photo  # Keep a reference
+        label.pack(fill=tk.BOTH, expand=True)
+        self.log(f"Sweep rendered: {grid.size[0]}x{grid.size[1]}")
+
+    def generate_deck(self):
+        params = self.update_deckgen_params()
+        if params is None:
+            return
+        if self.worker.running == RenderWorker.GENERATE:
+            self.log("A generation is already running; it will be followed by this one")
+        self.progress_bar.configure(value=0)
+        self.progress_label.configure(text="Loading assets...")
+        self.worker.submit(RenderWorker.GENERATE, lambda worker: self.run_generation(params),
+                           lambda written: self.generation_done(params, written),
+                           self.generation_failed)
+
+    def run_generation(self, params):
+        """Worker thread: generate the deck from a snapshot of the parameters, sharing the preview asset memo.
+
+        Generation has its own DeckGen so a preview run in between cards never swaps its parameters;
+        between runs it only recomputes the stages invalidated by the edited parameters.
+        """
+        deckgen = self.generation_deckgen
+        deckgen.loadParams(params)
+        output_folder = deckgen.input_data.output_folder
+        next_thumbnail = [0.0]
+
+        def progress(completed, total, filename):
+            # Decoding a written card is not free: refresh the thumbnail a few times per second at most
+            thumbnail = None
+            if time.monotonic() >= next_thumbnail[0] or completed == total:
+                next_thumbnail[0] = time.monotonic() + self.THUMBNAIL_INTERVAL
+                thumbnail = self.card_thumbnail(os.path.join(output_folder, filename))
+            self.worker.post(self.show_progress, completed, total, filename, thumbnail)
+
+        return deckgen.generate_deck(stop_callback=self.worker.should_stop, progress_callback=progress)
+
+    def card_thumbnail(self, path):
+        """Worker thread: downscale a written card for the progress display (None when it is not a file)."""
+        if not os.path.isfile(path):
+            return None
+        with Image.open(path) as image:
+            image.draft('RGB', self.THUMBNAIL_SIZE)
+            image.thumbnail(self.THUMBNAIL_SIZE)
+            return image.copy()
+
+    def show_progress(self, completed, total, filename, thumbnail):
+        self.progress_bar.configure(maximum=total, value=completed)
+        self.progress_label.configure(text=f"{completed}/{total} {filename}")
+        if thumbnail is not None:
+            photo = ImageTk.PhotoImage(thumbnail)
+            self.thumbnail_label.configure(image=photo)
+            self.thumbnail_label.image = photo  # Keep a reference
+
+    def generation_done(self, params, written):
+        self.progress_label.configure(text=f"Done: {written} files written")
+        self.log(f"Deck generated {params['prefix_string']} into {params['output_folder']} ({written} files written)", 'exec')
+
+    def generation_failed(self, e):
+        self.progress_label.configure(text="Generation failed")
+        self.log(f"Error generating deck: {str(e)}", 'error')
+
+    def stop_generation(self):
+        if not self.worker.busy:
+            self.log("No generation running")
+            return
+        self.worker.request_stop()
+        self.progress_label.configure(text="Stopping...")
+        self.log("Stop requested; cards in progress will finish")
+
+    def poll_worker(self):
+        self.worker.drain_events()
+        self.master.after(self.POLL_MS, self.poll_worker)
 
     def load_startup_config(self):
         config_path = os.path.join(os.getcwd(), "deckgen_conf.yaml")
@@ -242,7 +442,8 @@ class DeckGenGui:
             try:
                 with open(config_path, 'r') as f:
                     data = yaml.safe_load(f)
-                self.deckgen.loadParams(data)
+                self.deckgen.loadParams(copy.deepcopy(data))
+                self.parameters = data
                 self.update_gui_from_app()
                 self.log("Startup configuration loaded successfully")
             except Exception as e:
@@ -251,24 +452,21 @@ class DeckGenGui:
     def update_gui_from_app(self):
         for attr in ['input_folder', 'output_folder', 'prefix_string']:
             getattr(self, f"{attr}_entry").delete(0, tk.END)
-            getattr(self, f"{attr}_entry").insert(0, self.deckgen.parameters[attr])
+            getattr(self, f"{attr}_entry").insert(0, self.parameters[attr])
         self.params_text.delete('1.0', tk.END)
-        yaml_string = yaml.dump(self.deckgen.parameters['app_params'], default_flow_style=False)
+        yaml_string = yaml.dump(self.parameters['app_params'], default_flow_style=False)
         self.params_text.insert(tk.END, yaml_string)
 
     def update_deckgen_params(self):
+        """Read the parameters from the form; return a snapshot for the render worker, or None if invalid."""
         for attr in ['input_folder', 'output_folder', 'prefix_string']:
-            self.deckgen.parameters[attr] = getattr(self, f"{attr}_entry").get()
+            self.parameters[attr] = getattr(self, f"{attr}_entry").get()
         try:
-            self.deckgen.parameters['app_params'] = yaml.safe_load(self.params_text.get('1.0', tk.END))
+            self.parameters['app_params'] = yaml.safe_load(self.params_text.get('1.0', tk.END))
         except yaml.YAMLError as e:
             self.log(f"Invalid YAML in params section: {str(e)}", 'error')
-            return
-
-        try:
-            self.deckgen.loadParams(self.deckgen.parameters)
-        except Exception as e:
-            self.log(f"Error updating parameters: {str(e)}", 'error')
+            return None
+        return copy.deepcopy(self.parameters)
     
     def log(self, message, log_type='info', exception: Exception = None):
         # print exception
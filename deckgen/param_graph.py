@@ -0,0 +1,86 @@
+from typing import Dict, Iterable, Set, Tuple
+
+# Pipeline stages. Asset stages are the prepared inputs (CardGeneratorInput); layer
+# stages are the caches a PokerCardGenerator builds from them.
+ASSET_STAGES = ("back", "front", "suit shapes", "main suit", "font")
+LAYER_STAGES = ("suit base", "index stamps", "card", "output")
+ALL_STAGES = frozenset(ASSET_STAGES + LAYER_STAGES)
+
+# Stage -> stages built from it
+STAGE_DEPENDENTS: Dict[str, Set[str]] = {
+    "back": {"suit base"},
+    "front": {"suit base"},
+    "suit shapes": {"main suit", "index stamps"},
+    "main suit": {"suit base"},
+    "font": {"index stamps"},
+    "suit base": {"card"},
+    "index stamps": {"card"},
+    "card": {"output"},
+    "output": set(),
+}
+
+# Parameter path (top-level key, or (section, key) under app_params) -> stages it invalidates.
+# Keys not listed here invalidate everything; keys mapped to no stage change no output.
+PARAM_STAGES: Dict[Tuple[str, ...], Set[str]] = {
+    ("input_folder",): {"back", "front", "suit shapes", "font"},
+    ("output_folder",): {"output"},
+    ("prefix_string",): {"output"},
+    ("Design", "Preview index"): set(),
+    # Not read by the renderer yet: the index margin is fixed by PokerCardGenerator
+    ("Design", "card value margin"): set(),
+    ("Design", "card value padding"): set(),
+    ("Design", "main face scale"): set(),
+    ("Design", "main suit scale"): {"main suit"},
+    ("Design", "recolor main suit"): {"suit shapes"},
+    ("Design", "recolor tones"): {"suit shapes"},
+    ("Design", "recolor mode"): {"suit shapes"},
+    ("Design", "suit rendering"): {"suit shapes"},
+    ("Generation", "raster backend"): set(ALL_STAGES),
+    ("Generation", "compositor"): {"card"},
+    ("Generation", "output layout"): {"output"},
+    ("Generation", "pyramid scales"): {"output"},
+    ("Generation", "atlas columns"): {"output"},
+    ("Generation", "atlas rows"): {"output"},
+    ("Generation", "atlas scale"): {"output"},
+    ("Generation", "asset cache folder"): set(),
+    ("Generation", "workers"): set(),
+    ("Generation", "writer threads"): set(),
+    ("Generation", "max in flight"): set(),
+    ("Generation", "incremental"): set(),
+}
+
+
+def changed_params(old: dict, new: dict) -> Set[Tuple[str, ...]]:
+    """Return the parameter paths whose value differs between two parameter sets."""
+    changed = set()
+    for key in set(old) | set(new):
+        if key == "app_params":
+            old_sections, new_sections = old.get(key) or {}, new.get(key) or {}
+            for section in set(old_sections) | set(new_sections):
+                old_values, new_values = old_sections.get(section) or {}, new_sections.get(section) or {}
+                changed.update((section, name) for name in set(old_values) | set(new_values)
+                               if old_values.get(name) != new_values.get(name))
+        elif old.get(key) != new.get(key):
+            changed.add((key,))
+    return changed
+
+
+def downstream(stages: Iterable[str]) -> Set[str]:
+    """Close a set of stages over their dependents."""
+    pending, closed = list(stages), set()
+    while pending:
+        stage = pending.pop()
+        if stage not in closed:
+            closed.add(stage)
+            pending.extend(STAGE_DEPENDENTS[stage])
+    return closed
+
+
+def invalidated_stages(old: dict, new: dict) -> Set[str]:
+    """Stages to recompute when the parameters change from old to new (everything when old is None)."""
+    if old is None:
+        return set(ALL_STAGES)
+    stages = set()
+    for path in changed_params(old, new):
+        stages.update(PARAM_STAGES.get(path, ALL_STAGES))
+    return downstream(stages)
@@ -0,0 +1,90 @@
+import copy
+from dataclasses import dataclass
+from itertools import product
+from typing import Any, List, Tuple
+import numpy as np
+import yaml
+from PIL import Image, ImageDraw, ImageFont
+
+from param_graph import PARAM_STAGES
+
+
+@dataclass
+class SweepAxis:
+    """One swept parameter: its (section, key) path under app_params and the values to try."""
+    path: Tuple[str, str]
+    values: List[Any]
+
+    @property
+    def name(self) -> str:
+        return self.path[-1]
+
+    def label(self, value) -> str:
+        return f"{self.name}={value}"
+
+
+def resolve_param(name: str) -> Tuple[str, str]:
+    """Resolve 'Section/key' or a bare key known to param_graph (Design keys by default)."""
+    if "/" in name:
+        section, key = name.split("/", 1)
+        return section.strip(), key.strip()
+    name = name.strip()
+    for section in ("Design", "Generation"):
+        if (section, name) in PARAM_STAGES:
+            return section, name
+    return "Design", name
+
+
+def parse_values(spec: str) -> List[Any]:
+    """Parse 'start:stop:count' (evenly spaced, stop included) or a comma separated list of YAML values."""
+    parts = spec.split(":")
+    if len(parts) == 3:
+        start, stop, count = yaml.safe_load(parts[0]), yaml.safe_load(parts[1]), int(parts[2])
+        if count < 1:
+            raise ValueError(f"Invalid sweep range '{spec}': count must be at least 1")
+        values = np.linspace(start, stop, count)
+        if all(isinstance(v, int) for v in (start, stop)) and np.all(values == np.round(values)):
+            return [int(v) for v in values]
+        return [round(float(v), 4) for v in values]
+    return [yaml.safe_load(part.strip()) for part in spec.split(",")]
+
+
+def parse_axis(spec: str) -> SweepAxis:
+    """Parse 'key=values', e.g. 'main suit scale=0.6:1.2:4' or 'recolor mode=gradient,steps'."""
+    name, sep, values = spec.partition("=")
+    if not sep or not name.strip() or not values.strip():
+        raise ValueError(f"Invalid sweep '{spec}', expected key=start:stop:count or key=v1,v2,...")
+    return SweepAxis(resolve_param(name), parse_values(values))
+
+
+def sweep_variants(parameters: dict, axes: List[SweepAxis]) -> List[Tuple[List[str], dict]]:
+    """Return (labels, parameters) for every combination of the axes' values, first axis varying fastest."""
+    variants = []
+    for combination in product(*(axis.values for axis in reversed(axes))):
+        values = list(reversed(combination))
+        variant = copy.deepcopy(parameters)
+        for axis, value in zip(axes, values):
+            variant.setdefault("app_params", {}).setdefault(axis.path[0], {})[axis.path[1]] = value
+        variants.append(([axis.label(value) for axis, value in zip(axes, values)], variant))
+    return variants
+
+
+def sweep_grid(cells: List[Image.Image], labels: List[List[str]], columns: int, padding: int = 6,
+               background=(32, 32, 32), text_color=(230, 230, 230)) -> Image.Image:
+    """Lay out equally sized cells row by row with their labels captioned underneath."""
+    cell_w, cell_h = cells[0].size
+    font = ImageFont.load_default(size=max(10, cell_w // 14))
+    line_height = font.getbbox("Ag")[3] + 2
+    caption = line_height * max(len(lines) for lines in labels)
+    rows = -(-len(cells) // columns)
+    grid = Image.new('RGB', (columns * (cell_w + padding) + padding,
+                             rows * (cell_h + caption + padding) + padding), background)
+    draw = ImageDraw.Draw(grid)
+    for index, (cell, lines) in enumerate(zip(cells, labels)):
+        row, column = divmod(index, columns)
+        x = padding + column * (cell_w + padding)
+        y = padding + row * (cell_h + caption + padding)
+        grid.paste(cell, (x, y))
+        for line_index, line in enumerate(lines):
+            draw.text((x, y + cell_h + line_index * line_height), line, font=font, fill=text_color)
+    return grid
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+from typing import Any, Callable, List, Tuple
+from PIL import Image
+
+
+class PreviewPyramid:
+    """Mip pyramid of a rendered preview, for smooth interactive resizing.
+
+    Levels are halved with a box filter down to min_size. While a window is being
+    dragged, draft() scales the nearest level at or above the target size with a
+    bilinear filter; once resizing settles, frame() renders the target size with
+    LANCZOS from the full image and keeps the last few results (converted, e.g.
+    to PhotoImages) so recently seen sizes are shown straight away.
+    """
+
+    def __init__(self, image: Image.Image, min_size: int = 64, cached_frames: int = 8):
+        self.levels: List[Image.Image] = [image]
+        while min(self.levels[-1].size) // 2 >= min_size:
+            self.levels.append(self.levels[-1].reduce(2))
+        self.cached_frames = cached_frames
+        self._frames: 'OrderedDict[Tuple[int, int], Any]' = OrderedDict()
+
+    @property
+    def image(self) -> Image.Image:
+        return self.levels[0]
+
+    def fit(self, box: Tuple[int, int]) -> Tuple[int, int]:
+        """Largest size with the preview's aspect ratio fitting in box."""
+        width, height = max(box[0], 1), max(box[1], 1)
+        aspect_ratio = self.image.width / self.image.height
+        if width / height > aspect_ratio:
+            return max(1, int(height * aspect_ratio)), height
+        return width, max(1, int(width / aspect_ratio))
+
+    def level_for(self, size: Tuple[int, int]) -> Image.Image:
+        """Smallest level at least as large as size (the full image when upscaling)."""
+        for level in reversed(self.levels):
+            if level.width >= size[0] and level.height >= size[1]:
+                return level
+        return self.image
+
+    def draft(self, size: Tuple[int, int]) -> Image.Image:
+        """Cheap frame for use during a drag."""
+        level = self.level_for(size)
+        return level if level.size == tuple(size) else level.resize(size, Image.BILINEAR)
+
+    def cached_frame(self, size: Tuple[int, int]):
+        frame = self._frames.get(tuple(size))
+        if frame is not None:
+            self._frames.move_to_end(tuple(size))
+        return frame
+
+    def frame(self, size: Tuple[int, int], convert: Callable[[Image.Image], Any] = None):
+        """Full-quality frame at size, converted by convert and cached for recently seen sizes."""
+        size = tuple(size)
+        frame = self.cached_frame(size)
+        if frame is None:
+            image = self.image if self.image.size == size else self.image.resize(size, Image.LANCZOS)
+            frame = convert(image) if convert else image
+            self._frames[size] = frame
+            if len(self._frames) > self.cached_frames:
+                self._frames.popitem(last=False)
+        return frame
@@ -0,0 +1,121 @@
+import heapq
+import itertools
+import queue
+import threading
+import traceback
+from typing import Callable
+
+
+class RenderWorker:
+    """Background thread running deck jobs one at a time, preview jobs first.
+
+    Jobs are callables taking the worker. Long jobs pass should_stop as their
+    stop_callback: besides reporting the Stop button, it runs any queued job of
+    higher priority in between cards, so a preview never waits for a contact
+    sheet or a bulk generation to finish. Results are handed back with post() and run on the GUI thread by
+    drain_events(), which the GUI polls with after().
+    """
+
+    PREVIEW = 0
+    SHEET = 1
+    GENERATE = 2
+
+    def __init__(self):
+        self._jobs = []
+        self._order = itertools.count()
+        self._condition = threading.Condition()
+        self._events = queue.Queue()
+        self._stop = threading.Event()
+        self._closed = False
+        self.running = None  # priority of the job in progress, None when idle
+        self._thread = threading.Thread(target=self._run, name="deckgen-render", daemon=True)
+        self._thread.start()
+
+    def submit(self, priority: int, job: Callable, on_done: Callable = None, on_error: Callable = None, kind=None):
+        """Queue job(worker); on_done(result) or on_error(exception) are posted back to the GUI thread.
+
+        kind (the priority by default) names what the job produces: a new preview or
+        sheet replaces a waiting one of the same kind, other jobs of that priority stay queued.
+        """
+        kind = priority if kind is None else kind
+        with self._condition:
+            if priority != self.GENERATE:
+                # Only the latest preview (or sheet) matters; drop older ones still waiting
+                self._jobs = [entry for entry in self._jobs if entry[2] != kind]
+                heapq.heapify(self._jobs)
+            heapq.heappush(self._jobs, (priority, next(self._order), kind, job, on_done, on_error))
+            self._condition.notify()
+
+    def request_stop(self):
+        """Drop queued generations and ask the running one to stop after the cards already in progress."""
+        with self._condition:
+            self._jobs = [entry for entry in self._jobs if entry[0] != self.GENERATE]
+            heapq.heapify(self._jobs)
+        self._stop.set()
+
+    def should_stop(self) -> bool:
+        """stop_callback for long jobs: run queued higher-priority jobs first, then report whether Stop was pressed."""
+        if self.running:
+            self.run_pending(self.running - 1)
+        return self._stop.is_set()
+
+    @property
+    def busy(self) -> bool:
+        return self.running is not None
+
+    def run_pending(self, max_priority: int):
+        """Run queued jobs of priority up to max_priority on the calling (worker) thread."""
+        while True:
+            with self._condition:
+                if not self._jobs or self._jobs[0][0] > max_priority:
+                    return
+                entry = heapq.heappop(self._jobs)
+            self._execute(entry)
+
+    def post(self, callback: Callable, *args):
+        """Queue callback(*args) to run on the GUI thread at the next drain_events()."""
+        self._events.put((callback, args))
+
+    def drain_events(self):
+        while True:
+            try:
+                callback, args = self._events.get_nowait()
+            except queue.Empty:
+                return
+            callback(*args)
+
+    def shutdown(self, timeout: float = None):
+        with self._condition:
+            self._closed = True
+            self._jobs.clear()
+            self._condition.notify()
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._jobs and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+                entry = heapq.heappop(self._jobs)
+            self._execute(entry)
+
+    def _execute(self, entry):
+        priority, _, _, job, on_done, on_error = entry
+        outer, self.running = self.running, priority
+        if outer is None:
+            # A new top-level job starts; jobs run inside one share its stop request
+            self._stop.clear()
+        try:
+            result = job(self)
+        except Exception as e:
+            traceback.print_exc()
+            if on_error:
+                self.post(on_error, e)
+        else:
+            if on_done:
+                self.post(on_done, result)
+        finally:
+            self.running = outer
@@ -0,0 +1,72 @@
+from typing import Tuple
+import numpy as np
+import cv2
+from PIL import Image
+
+from asset_cache import RenderCache
+from raster_backend import PillowBackend, get_backend
+
+
+class SuitSDF:
+    """Compact signed distance field of a suit shape, rasterized at any size on demand.
+
+    The field is derived once from the suit's alpha channel and stored at field_size
+    on its long side, in field pixels (positive inside the shape). Rendering
+    resamples it to the requested size and turns distance into a one-pixel
+    antialiased edge, so the outline stays sharp at every scale; colour comes from
+    the suit image resized bilinearly. Rendered suits are cached per size.
+    """
+
+    def __init__(self, field: np.ndarray, color: Image.Image):
+        self.field = field
+        self.color = color
+        self._rendered = RenderCache()
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """Size of the source suit image the field was derived from."""
+        return self.color.size
+
+    @classmethod
+    def from_image(cls, image: Image.Image, field_size: int = 256) -> 'SuitSDF':
+        image = image.convert('RGBA')
+        alpha = np.asarray(image.getchannel('A'))
+        inside = alpha >= 128
+
+        # Distances from pixel centres to the nearest pixel on the other side, with the
+        # edge half a pixel between; antialiased edge pixels keep their sub-pixel coverage
+        dist_in = cv2.distanceTransform(inside.astype(np.uint8), cv2.DIST_L2, 5)
+        dist_out = cv2.distanceTransform((~inside).astype(np.uint8), cv2.DIST_L2, 5)
+        distance = np.where(inside, dist_in - 0.5, 0.5 - dist_out)
+        edge = (alpha > 0) & (alpha < 255)
+        distance[edge] = alpha[edge] / 255 - 0.5
+
+        scale = field_size / max(image.size)
+        field_dims = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        field = cv2.resize(distance.astype(np.float32), field_dims, interpolation=cv2.INTER_AREA) * scale
+
+        # Fill the transparent area with the mean suit colour so bilinear resizing
+        # does not bleed the background into the edge
+        rgb = np.array(image.convert('RGB'))
+        if inside.any():
+            rgb[~inside] = rgb[inside].mean(axis=0).round().astype(np.uint8)
+        return cls(field, Image.fromarray(rgb, 'RGB'))
+
+    def mask(self, size: Tuple[int, int]) -> Image.Image:
+        """Rasterize the suit coverage at size as an 'L' mask."""
+        scale = (size[0] / self.field.shape[1] + size[1] / self.field.shape[0]) / 2
+        distance = cv2.resize(self.field, size, interpolation=cv2.INTER_LINEAR) * scale
+        coverage = np.clip(distance + 0.5, 0, 1)
+        return Image.fromarray(np.rint(coverage * 255).astype(np.uint8), 'L')
+
+    def render(self, size: Tuple[int, int], raster: PillowBackend = None) -> Image.Image:
+        """Return the RGBA suit at size, cached per size."""
+        raster = raster or get_backend()
+        size = tuple(size)
+
+        def build():
+            image = raster.resize(self.color, size, Image.BILINEAR).convert('RGBA')
+            image.putalpha(self.mask(size))
+            return image
+
+        return self._rendered.get((size, raster.name), build)
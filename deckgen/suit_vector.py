@@ -0,0 +1,142 @@
+import os
+import json
+import concurrent.futures
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+import numpy as np
+import cv2
+from scipy import interpolate
+from PIL import Image, ImageDraw
+
+from asset_cache import RenderCache
+from deck_manifest import file_digest
+
+SIDECAR_SUFFIX = ".path.json"
+SIDECAR_VERSION = 1
+
+
+@dataclass
+class SuitPath:
+    """Vector outline of a suit: the periodic spline fitted to its largest contour and the polygon sampled from it.
+
+    Coordinates are in pixels of the source image (size), so the outline can be
+    rasterized at any target size.
+    """
+    size: Tuple[int, int]
+    tck: list
+    polygon: List[Tuple[float, float]]
+
+    @classmethod
+    def fit(cls, image: Image.Image, smoothness: float, curve_points: int) -> 'SuitPath':
+        """Trace the largest contour, simplify it by smoothness (a fraction of its length) and fit a periodic spline."""
+        if 'A' in image.getbands():
+            binary = np.where(np.asarray(image.getchannel('A')) >= 128, 255, 0).astype(np.uint8)
+        else:
+            # Opaque suit art on a white background
+            _, binary = cv2.threshold(np.asarray(image.convert('L')), 250, 255, cv2.THRESH_BINARY_INV)
+
+        contours, _ = cv2.findContours(binary, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        if not contours:
+            raise ValueError("No suit shape found in image")
+        largest_contour = max(contours, key=cv2.contourArea)
+
+        epsilon = smoothness * cv2.arcLength(largest_contour, True)
+        points = cv2.approxPolyDP(largest_contour, epsilon, True).reshape(-1, 2).astype(np.float64)
+        # Contour points are pixel indices; shift them to pixel centres and close the loop
+        points = np.vstack([points, points[:1]]) + 0.5
+
+        tck, _ = interpolate.splprep([points[:, 0], points[:, 1]], s=0, per=True)
+        x, y = interpolate.splev(np.linspace(0, 1, curve_points, endpoint=False), tck)
+        knots, coefficients, degree = tck
+        return cls(size=image.size,
+                   tck=[knots.tolist(), [c.tolist() for c in coefficients], int(degree)],
+                   polygon=list(zip(x.tolist(), y.tolist())))
+
+    def mask(self, size: Tuple[int, int], supersample: int = 4) -> Image.Image:
+        """Fill the polygon at size times supersample and box-reduce it to an antialiased 'L' mask."""
+        sx = size[0] * supersample / self.size[0]
+        sy = size[1] * supersample / self.size[1]
+        canvas = Image.new('L', (size[0] * supersample, size[1] * supersample), 0)
+        ImageDraw.Draw(canvas).polygon([(x * sx, y * sy) for x, y in self.polygon], fill=255)
+        return canvas.reduce(supersample)
+
+    def to_json(self) -> dict:
+        return {"size": list(self.size), "tck": self.tck, "polygon": [list(p) for p in self.polygon]}
+
+    @classmethod
+    def from_json(cls, data: dict) -> 'SuitPath':
+        return cls(size=tuple(data["size"]), tck=data["tck"], polygon=[tuple(p) for p in data["polygon"]])
+
+
+def sidecar_path(source: str) -> str:
+    return source + SIDECAR_SUFFIX
+
+
+def load_suit_path(source: str, smoothness: float, curve_points: int) -> SuitPath:
+    """Return the suit path for a source image, from its sidecar when the source hash and fit parameters match.
+
+    On a miss the path is fitted and the sidecar rewritten next to the source; a
+    read-only input folder only costs the refit on the next load.
+    """
+    key = {"version": SIDECAR_VERSION, "source": file_digest(source), "params": [smoothness, curve_points]}
+    path = sidecar_path(source)
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            if data.get("key") == key:
+                return SuitPath.from_json(data["path"])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ignoring unreadable suit path {path}: {e}")
+
+    suit_path = SuitPath.fit(Image.open(source), smoothness, curve_points)
+    try:
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"key": key, "path": suit_path.to_json()}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not write suit path {path}: {e}")
+    return suit_path
+
+
+def load_suit_paths(sources: Dict[str, str], smoothness: float, curve_points: int) -> Dict[str, SuitPath]:
+    """Load or fit the paths of several suits in parallel, one thread per suit."""
+    if not sources:
+        return {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(sources)) as executor:
+        futures = {suit: executor.submit(load_suit_path, source, smoothness, curve_points)
+                   for suit, source in sources.items()}
+        return {suit: future.result() for suit, future in futures.items()}
+
+
+class VectorSuit:
+    """A suit path with its fill colour, rasterized on demand and cached per size."""
+
+    def __init__(self, path: SuitPath, color: Tuple[int, int, int]):
+        self.path = path
+        self.color = tuple(color)
+        self._rendered = RenderCache()
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.path.size
+
+    @classmethod
+    def from_image(cls, path: SuitPath, image: Image.Image) -> 'VectorSuit':
+        """Fill with the mean colour of the opaque pixels of the (recoloured) suit image."""
+        pixels = np.asarray(image.convert('RGBA'))
+        opaque = pixels[..., 3] >= 128
+        color = pixels[opaque][:, :3].mean(axis=0) if opaque.any() else np.zeros(3)
+        return cls(path, tuple(int(c) for c in color.round()))
+
+    def render(self, size: Tuple[int, int], raster=None) -> Image.Image:
+        """Return the RGBA suit at size; the raster backend is not needed to fill a polygon."""
+        size = tuple(size)
+
+        def build():
+            image = Image.new('RGBA', size, self.color + (0,))
+            image.putalpha(self.path.mask(size))
+            return image
+
+        return self._rendered.get(size, build)
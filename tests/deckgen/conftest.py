@@ -0,0 +1,6 @@
+import os
+import sys
+
+# deckgen modules import each other script-style (as when the GUI runs from deckgen/),
+# so the test modules import them the same way
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../deckgen')))
@@ -0,0 +1,52 @@
+import os
+import shutil
+from PIL import Image, ImageDraw
+
+ROBOTO_TTF = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../assets/fonts/Roboto/Roboto-Bold.ttf'))
+
+SUITS = ['heart', 'diamond', 'club', 'spades']
+
+
+def make_input_folder(folder):
+    """Write a synthetic deckgen input folder: front/back images, four suits and the Roboto TTF."""
+    os.makedirs(folder, exist_ok=True)
+
+    Image.new('RGB', (624, 936), (235, 230, 215)).save(os.path.join(folder, "im-front-01.png"))
+    back = Image.new('RGB', (624, 936), (40, 60, 120))
+    ImageDraw.Draw(back).rectangle((40, 40, 584, 896), outline=(200, 180, 60), width=12)
+    back.save(os.path.join(folder, "im-back.png"))
+
+    for i, suit in enumerate(SUITS):
+        suit_image = Image.new('RGBA', (512, 512), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(suit_image)
+        if i % 2:
+            draw.polygon([(256, 40), (472, 256), (256, 472), (40, 256)], fill=(20, 20, 20, 255))
+        else:
+            draw.ellipse((60, 60, 452, 452), fill=(20, 20, 20, 255))
+        suit_image.save(os.path.join(folder, f"suit-{suit}.png"))
+
+    shutil.copy(ROBOTO_TTF, os.path.join(folder, "Roboto-Bold.ttf"))
+    return folder
+
+
+def make_parameters(input_folder, output_folder, **design):
+    parameters = {
+        "input_folder": input_folder,
+        "output_folder": output_folder,
+        "prefix_string": "test_card",
+        "app_params": {
+            "Design": {
+                "Preview index": 0,
+                "card value margin": 10,
+                "card value padding": 10,
+                "main suit scale": 1,
+                "main face scale": 1,
+                "recolor main suit": True,
+            },
+            "Generation": {
+                "workers": 1,
+            },
+        },
+    }
+    parameters["app_params"]["Design"].update(design)
+    return parameters
@@ -0,0 +1,160 @@
+"""Benchmarks for the deckgen render pipeline.
+
+Skipped unless DECKGEN_BENCH=1. Each benchmark stores its best-of-N time in
+test_output/deckgen_bench.json (or DECKGEN_BENCH_OUTPUT) and fails when it is
+slower than tests/deckgen/benchmark_baseline.json by more than
+DECKGEN_BENCH_TOLERANCE (a fraction, default 0.5). Set DECKGEN_BENCH_UPDATE=1
+to write the measured times as the new baseline.
+"""
+import os
+import json
+import time
+import pytest
+from PIL import Image
+
+from deckgen import DeckGen, CardConstants, CardGeneratorInput, extract_suit
+from tests.deckgen.fixture_assets import make_input_folder, make_parameters
+
+pytestmark = pytest.mark.skipif(os.environ.get("DECKGEN_BENCH") != "1", reason="set DECKGEN_BENCH=1 to run benchmarks")
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+RESULTS_PATH = os.environ.get("DECKGEN_BENCH_OUTPUT", os.path.join("test_output", "deckgen_bench.json"))
+TOLERANCE = float(os.environ.get("DECKGEN_BENCH_TOLERANCE", "0.5"))
+
+
+def load_json(path):
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            return json.load(f)
+    return {}
+
+
+def save_json(path, data):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def benchmark(name, fn, repeat=5, setup=None):
+    """Time fn() repeat times, record the best run and compare it with the stored baseline."""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+
+    results = load_json(RESULTS_PATH)
+    results[name] = {"best_s": best, "mean_s": sum(times) / len(times), "repeat": repeat}
+    save_json(RESULTS_PATH, results)
+
+    baseline = load_json(BASELINE_PATH)
+    if os.environ.get("DECKGEN_BENCH_UPDATE") == "1":
+        baseline[name] = round(best, 6)
+        save_json(BASELINE_PATH, baseline)
+    elif name in baseline:
+        limit = baseline[name] * (1 + TOLERANCE)
+        assert best <= limit, f"{name}: {best:.4f}s exceeds baseline {baseline[name]:.4f}s by more than {TOLERANCE:.0%}"
+    return best
+
+
+@pytest.fixture(scope="module")
+def bench_folder(tmp_path_factory):
+    root = tmp_path_factory.mktemp("bench")
+    return str(root), make_input_folder(str(root / "input"))
+
+
+@pytest.fixture
+def deckgen(bench_folder):
+    root, input_folder = bench_folder
+    deckgen = DeckGen()
+    deckgen.loadParams(make_parameters(input_folder, os.path.join(root, "out")))
+    return deckgen
+
+
+def test_bench_initialize_assets(bench_folder):
+    root, input_folder = bench_folder
+    parameters = make_parameters(input_folder, os.path.join(root, "out"))
+
+    def load():
+        CardGeneratorInput(input_folder, os.path.join(root, "out"), "bench").initialize_assets(parameters)
+
+    benchmark("initialize_assets", load)
+
+
+def test_bench_extract_suit(bench_folder):
+    _, input_folder = bench_folder
+    suit_image = Image.open(os.path.join(input_folder, "suit-heart.png"))
+    suit_image.load()
+    parameters = make_parameters(input_folder, "", **{"main suit scale": 1.2})
+    benchmark("extract_suit", lambda: extract_suit(suit_image, "heart", parameters), repeat=10)
+
+
+def test_bench_create_stacked_value_suit(deckgen):
+    generator = deckgen.generator
+    color = generator.suit_color("club")
+    benchmark("create_stacked_value_suit", lambda: generator.create_stacked_value_suit("10", "club", color), repeat=20)
+
+
+def test_bench_generate_card_image(deckgen):
+    generator = deckgen.generator
+    benchmark("generate_card_image", lambda: generator.generate_card_image(37, return_image=True), repeat=10)
+
+
+def test_bench_generate_card_image_save(deckgen):
+    generator = deckgen.generator
+    benchmark("generate_card_image_save", lambda: generator.generate_card_image(37), repeat=3)
+
+
+def test_bench_generate_deck(deckgen):
+    deckgen.parameters["app_params"]["Generation"]["incremental"] = False
+    benchmark("generate_deck", deckgen.generate_deck, repeat=1)
+
+
+@pytest.mark.parametrize("backend", ["pillow", "opencv"])
+def test_bench_raster_backend(bench_folder, backend):
+    """Compare raster backends on asset load plus uncached card rendering, to pick the faster one per machine."""
+    root, input_folder = bench_folder
+    parameters = make_parameters(input_folder, os.path.join(root, "out"), **{"main suit scale": 0.8})
+    parameters["app_params"]["Generation"]["raster backend"] = backend
+    deckgen = DeckGen()
+
+    def render():
+        deckgen.asset_memo.clear()
+        deckgen.loadParams(parameters)
+        for card in (0, 17, 34, 51):
+            deckgen.generator.generate_card_image(card, return_image=True)
+
+    benchmark(f"raster_backend_{backend}", render, repeat=3)
+
+
+@pytest.mark.parametrize("rendering", ["raster", "sdf", "vector"])
+def test_bench_suit_rendering(bench_folder, rendering):
+    """Asset load plus all 52 index stamps, rasterizing suits by resize or from their distance fields or vector paths."""
+    root, input_folder = bench_folder
+    parameters = make_parameters(input_folder, os.path.join(root, "out"), **{"suit rendering": rendering})
+    deckgen = DeckGen()
+
+    def render():
+        deckgen.asset_memo.clear()
+        deckgen.loadParams(parameters)
+        for suit in CardConstants.SUITS:
+            for value in CardConstants.VALUES:
+                deckgen.generator.create_stacked_value_suit(value, suit, deckgen.generator.suit_color(suit))
+
+    benchmark(f"suit_rendering_{rendering}", render, repeat=3)
+
+
+def test_bench_param_edit_preview(deckgen):
+    """Interactive tuning: edit one design parameter, reload and re-render the preview."""
+    parameters = deckgen.parameters
+    scales = iter([0.8, 0.9] * 10)
+
+    def edit_and_preview():
+        parameters["app_params"]["Design"]["main suit scale"] = next(scales)
+        deckgen.loadParams(parameters)
+        deckgen.preview_card(20, scale=0.5)
+
+    benchmark("param_edit_preview", edit_and_preview, repeat=6)
@@ -0,0 +1,52 @@
+import os
+
+from contact_sheet import ContactSheet
+from deckgen import DeckGen
+from tests.deckgen.fixture_assets import make_input_folder, make_parameters
+
+
+def test_contact_sheet_grid_and_cache(tmp_path):
+    parameters = make_parameters(make_input_folder(str(tmp_path / "input")), str(tmp_path / "out"))
+    deckgen = DeckGen()
+    deckgen.loadParams(parameters)
+    sheet = ContactSheet(scale=0.05, padding=2)
+
+    cells = {}
+    image = sheet.render(deckgen, workers=3, on_cell=lambda card_id, cell, origin: cells.setdefault(card_id, origin))
+    assert (sheet.rendered, sheet.reused) == (52, 0)
+    assert image.size == (13 * (62 + 2) + 2, 4 * (94 + 2) + 2)
+    assert cells[0] == (2, 2) and cells[14] == (2 + 64, 2 + 96)
+
+    # Cells are the card faces rendered at thumbnail scale
+    generator = deckgen.preview_generator(0.05)
+    face = generator.render_card(14, 'diamond', '3', face_only=True)
+    assert image.crop((66, 98, 66 + 62, 98 + 94)).tobytes() == face.tobytes()
+    assert not os.listdir(tmp_path / "out")
+
+    # Unchanged cards are served from the cache, also after an edit that changes no output;
+    # a design change that does re-renders them
+    deckgen.loadParams(parameters)
+    assert sheet.render(deckgen).tobytes() == image.tobytes()
+    assert (sheet.rendered, sheet.reused) == (0, 52)
+
+    parameters["app_params"]["Design"]["card value margin"] = 30
+    deckgen.loadParams(parameters)
+    sheet.render(deckgen)
+    assert (sheet.rendered, sheet.reused) == (0, 52)
+
+    parameters["app_params"]["Design"]["main suit scale"] = 0.5
+    deckgen.loadParams(parameters)
+    sheet.render(deckgen)
+    assert (sheet.rendered, sheet.reused) == (52, 0)
+
+
+def test_contact_sheet_stop(tmp_path):
+    parameters = make_parameters(make_input_folder(str(tmp_path / "input")), str(tmp_path / "out"))
+    deckgen = DeckGen()
+    deckgen.loadParams(parameters)
+    sheet = ContactSheet(scale=0.05)
+
+    sheet.render(deckgen, workers=1, stop_callback=lambda: sheet.rendered >= 5)
+    assert sheet.rendered == 5
+    sheet.render(deckgen, workers=2)
+    assert (sheet.rendered, sheet.reused) == (47, 5)
@@ -0,0 +1,73 @@
+import numpy as np
+from PIL import Image
+
+from deck_tensor import TensorCompositor
+from deckgen import DeckGen
+from tests.deckgen.fixture_assets import make_input_folder, make_parameters
+
+TOLERANCE = 1
+
+
+def load_deckgen(tmp_path, **design):
+    deckgen = DeckGen()
+    deckgen.loadParams(make_parameters(make_input_folder(str(tmp_path / "input")), str(tmp_path / "out"), **design))
+    return deckgen
+
+
+def assert_close(image, reference):
+    difference = np.abs(np.asarray(image, dtype=np.int16) - np.asarray(reference, dtype=np.int16))
+    assert difference.max() <= TOLERANCE
+
+
+def test_tensor_suit_matches_pillow_cards(tmp_path):
+    deckgen = load_deckgen(tmp_path, **{"main suit scale": 1.6})
+    generator = deckgen.generator
+    compositor = TensorCompositor(generator)
+
+    values = ['2', '10', 'Q', 'A']
+    batch = compositor.render_suit('diamond', values)
+    assert batch.shape == (4, 1872, 2496, 3)
+    for value, pixels in zip(values, batch):
+        assert_close(pixels, generator.render_card(0, 'diamond', value))
+
+
+def test_tensor_faces_match_at_reduced_scale(tmp_path):
+    generator = load_deckgen(tmp_path).preview_generator(0.3)
+    cards = [(13 * 3 + 9, 'spades', 'J'), (4, 'heart', '6')]
+    for card, image in TensorCompositor(generator).render_cards(cards, with_back=False):
+        assert image.size == generator.half_card_size
+        assert_close(image, generator.render_card(*card, face_only=True))
+
+
+def test_numpy_compositor_generates_same_files(tmp_path):
+    deckgen = load_deckgen(tmp_path)
+    deckgen.input_data.n_card_gen = 15
+    deckgen.parameters["app_params"]["Generation"].update({"compositor": "numpy", "incremental": False})
+    assert deckgen.generate_deck() == 15
+    assert_close(Image.open(tmp_path / "out" / "test_card_15_3_D.png"), deckgen.preview_card(14))
+
+
+def test_tensor_clips_a_suit_larger_than_the_card(tmp_path):
+    # A 512px suit at scale 4 overflows the 1248x1872 front on every side
+    generator = load_deckgen(tmp_path, **{"main suit scale": 4}).preview_generator(0.25)
+    assert generator.input_data.suit_images['club'].width > generator.half_card_size[1]
+    for card, image in TensorCompositor(generator).render_cards([(26, 'club', '2'), (30, 'club', '6')]):
+        assert_close(image, generator.render_card(*card))
+
+
+def test_worker_and_cli_paths_use_the_numpy_compositor(tmp_path):
+    from deckgen_cli import BatchRenderer, CardTask
+
+    deckgen = load_deckgen(tmp_path)
+    parameters = deckgen.parameters
+    parameters["app_params"]["Generation"]["compositor"] = "numpy"
+
+    # Worker processes write each card through generate_card_image
+    deckgen.loadParams(parameters)
+    assert deckgen.generator.generate_card_image(3) == "test_card_04_5_H.png"
+    assert deckgen.generator.tensor_compositor is not None
+
+    renderer = BatchRenderer([parameters])
+    renderer.render(CardTask(0, 20, "test_card_21_9_D.png"))
+    assert renderer.deck(0).generator.tensor_compositor is not None
+    assert_close(Image.open(tmp_path / "out" / "test_card_21_9_D.png"), deckgen.generator.render_card(20, 'diamond', '9'))
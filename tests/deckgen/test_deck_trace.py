@@ -0,0 +1,36 @@
+import json
+
+from deck_trace import TRACER, Tracer
+from deckgen import DeckGen
+from tests.deckgen.fixture_assets import make_input_folder, make_parameters
+
+
+def test_disabled_tracer_records_nothing():
+    tracer = Tracer()
+    with tracer.span("composite"):
+        pass
+    assert tracer.events == []
+
+
+def test_trace_covers_pipeline_stages(tmp_path):
+    TRACER.reset()
+    TRACER.enable()
+    try:
+        deckgen = DeckGen()
+        deckgen.loadParams(make_parameters(make_input_folder(str(tmp_path / "input")), str(tmp_path / "out")))
+        deckgen.input_data.n_card_gen = 2
+        deckgen.generate_deck()
+    finally:
+        TRACER.disable()
+
+    stages = TRACER.stage_totals()
+    for stage in ["loadParams", "initialize_assets", "extract_suit", "asset load", "font load", "index stamp",
+                  "text rasterize", "suit base", "composite", "png encode", "disk write"]:
+        assert stage in stages, stage
+    assert stages["composite"]["count"] == 2
+
+    trace_path = tmp_path / "trace.json"
+    TRACER.export_chrome_trace(str(trace_path))
+    events = json.loads(trace_path.read_text())["traceEvents"]
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+    assert "png encode" in TRACER.summary_table()
@@ -0,0 +1,339 @@
+import copy
+import os
+
+from deckgen import DeckGen
+from raster_backend import get_backend
+from tests.deckgen.fixture_assets import make_input_folder, make_parameters
+
+
+def load_deckgen(tmp_path, n_card_gen=52, **design):
+    input_folder = make_input_folder(str(tmp_path / "input"))
+    deckgen = DeckGen()
+    deckgen.loadParams(make_parameters(input_folder, str(tmp_path / "out"), **design))
+    deckgen.input_data.n_card_gen = n_card_gen
+    return deckgen
+
+
+def card_files(folder):
+    return sorted(name for name in os.listdir(folder) if name.endswith(".png"))
+
+
+def test_parallel_generation_matches_serial(tmp_path):
+    deckgen = load_deckgen(tmp_path, n_card_gen=3)
+    events = []
+    deckgen.generate_deck(workers=2, progress_callback=lambda done, total, name: events.append((done, total, name)))
+
+    expected = ["test_card_01_2_H.png", "test_card_02_3_H.png", "test_card_03_4_H.png"]
+    assert card_files(tmp_path / "out") == expected
+    assert [done for done, _, _ in events] == [1, 2, 3]
+    assert all(total == 3 for _, total, _ in events)
+    assert sorted(name for _, _, name in events) == expected
+
+
+def test_stop_callback_cancels_generation(tmp_path):
+    deckgen = load_deckgen(tmp_path, n_card_gen=52)
+    deckgen.generate_deck(stop_callback=lambda: True, workers=2)
+    assert card_files(tmp_path / "out") == []
+
+
+def test_index_atlas_reuses_stamps(tmp_path):
+    deckgen = load_deckgen(tmp_path)
+    generator = deckgen.generator
+    atlas = generator.build_index_atlas()
+    assert len(atlas) == 52
+
+    upright, rotated = generator.index_stamps('10', 'club')
+    assert generator.index_stamps('10', 'club')[0] is upright
+    assert rotated.tobytes() == upright.rotate(180).tobytes()
+    assert upright.tobytes() == generator.create_stacked_value_suit('10', 'club', generator.suit_color('club')).tobytes()
+
+
+def test_precomposed_card_matches_layered_composite(tmp_path):
+    from PIL import Image
+
+    deckgen = load_deckgen(tmp_path)
+    generator = deckgen.generator
+    input_data = deckgen.input_data
+
+    # Layer-by-layer composite the way each card used to be built
+    front = input_data.front_image.copy()
+    stamp = generator.create_stacked_value_suit('Q', 'diamond', generator.suit_color('diamond'))
+    front.paste(stamp, (50, 50), stamp)
+    rotated = stamp.rotate(180)
+    front.paste(rotated, (1198 - rotated.width, 1822 - rotated.height), rotated)
+    suit_image = input_data.suit_images['diamond']
+    front.paste(suit_image, ((1248 - suit_image.width) // 2, (1872 - suit_image.height) // 2), suit_image)
+    expected = Image.new('RGB', (2496, 1872))
+    expected.paste(front, (0, 0))
+    expected.paste(input_data.back_image, (1248, 0))
+
+    card = deckgen.preview_card(23)
+    assert card.tobytes() == expected.tobytes()
+    assert generator.suit_base('diamond') is generator.suit_base('diamond')
+
+
+def test_pipelined_writer_flushes_all_cards(tmp_path):
+    deckgen = load_deckgen(tmp_path, n_card_gen=4)
+    deckgen.parameters["app_params"]["Generation"].update({"writer threads": 2, "max in flight": 2})
+    events = []
+    written = deckgen.generate_deck(progress_callback=lambda done, total, name: events.append(done))
+
+    assert written == 4
+    assert sorted(events) == [1, 2, 3, 4]
+    assert len(card_files(tmp_path / "out")) == 4
+
+
+def test_card_writer_bounds_in_flight_canvases(tmp_path):
+    import threading
+    from PIL import Image
+    from card_writer import CardWriter
+
+    release = threading.Event()
+    writer = CardWriter(str(tmp_path), writer_threads=1, max_in_flight=2,
+                        on_written=lambda written, filename: release.wait(5))
+    writer.submit(Image.new('RGB', (8, 8)), "a.png")
+    writer.submit(Image.new('RGB', (8, 8)), "b.png")
+
+    blocked = threading.Thread(target=writer.submit, args=(Image.new('RGB', (8, 8)), "c.png"))
+    blocked.start()
+    blocked.join(0.3)
+    assert blocked.is_alive()
+
+    release.set()
+    blocked.join(5)
+    assert writer.close() == 3
+
+
+def test_incremental_run_skips_unchanged_cards(tmp_path):
+    deckgen = load_deckgen(tmp_path, n_card_gen=3)
+    stop_after_two = iter([False, False, True])
+    assert deckgen.generate_deck(stop_callback=lambda: next(stop_after_two)) == 2
+
+    # Resume renders only the missing card, then nothing is left to do
+    assert deckgen.generate_deck() == 1
+    assert deckgen.generate_deck() == 0
+
+    # Touching an output file or a design parameter invalidates it
+    os.remove(tmp_path / "out" / "test_card_02_3_H.png")
+    assert deckgen.generate_deck() == 1
+    deckgen.loadParams(make_parameters(deckgen.parameters["input_folder"], str(tmp_path / "out"), **{"main suit scale": 0.5}))
+    deckgen.input_data.n_card_gen = 3
+    assert deckgen.generate_deck() == 3
+
+    # So does a backend that changes the output pixels
+    for key, value in (("raster backend", "opencv"), ("compositor", "numpy")):
+        parameters = copy.deepcopy(deckgen.parameters)
+        parameters["app_params"]["Generation"][key] = value
+        deckgen.loadParams(parameters)
+        deckgen.input_data.n_card_gen = 3
+        assert deckgen.generate_deck() == 3
+
+
+def test_load_params_rebuilds_only_invalidated_assets(tmp_path):
+    deckgen = load_deckgen(tmp_path)
+    memo = deckgen.asset_memo
+    front, heart = deckgen.input_data.front_image, deckgen.input_data.suit_images['heart']
+    misses = memo.misses
+
+    deckgen.loadParams(deckgen.parameters)
+    assert memo.misses == misses
+    assert deckgen.input_data.front_image is front
+
+    deckgen.parameters["app_params"]["Design"]["main suit scale"] = 0.5
+    deckgen.loadParams(deckgen.parameters)
+    assert memo.misses == misses + 4
+    assert deckgen.input_data.front_image is front
+    assert deckgen.input_data.suit_images['heart'] is not heart
+    assert deckgen.input_data.suit_images['heart'].size == (256, 256)
+
+
+def test_baked_asset_cache_attaches_without_decoding(tmp_path, monkeypatch):
+    input_folder = make_input_folder(str(tmp_path / "input"))
+    parameters = make_parameters(input_folder, str(tmp_path / "out"))
+    parameters["app_params"]["Generation"]["asset cache folder"] = str(tmp_path / "cache")
+
+    first = DeckGen()
+    first.loadParams(parameters)
+    assert len(os.listdir(tmp_path / "cache")) == 6
+
+    # A fresh DeckGen (as in a new process) reads the baked arrays back instead of decoding PNGs
+    second = DeckGen()
+    second.loadParams(parameters)
+    for suit in ['heart', 'diamond', 'club', 'spades']:
+        assert second.input_data.suit_images[suit].tobytes() == first.input_data.suit_images[suit].tobytes()
+    assert second.input_data.front_image.tobytes() == first.input_data.front_image.tobytes()
+    assert second.preview_card(5).tobytes() == first.preview_card(5).tobytes()
+
+    # The central suit at another scale is baked as well: a new process attaches it instead of resizing
+    parameters["app_params"]["Design"]["main suit scale"] = 0.5
+    DeckGen().loadParams(parameters)
+    assert len(os.listdir(tmp_path / "cache")) == 10
+    backend = get_backend()
+    resized = []
+    resize = type(backend).resize
+    monkeypatch.setattr(type(backend), "resize", lambda self, *args, **kwargs: resized.append(args[1]) or resize(self, *args, **kwargs))
+    third = DeckGen()
+    third.loadParams(parameters)
+    assert resized == []
+    assert third.input_data.suit_images['club'].size == (256, 256)
+
+
+def test_reduced_resolution_preview_matches_downsized_card(tmp_path):
+    import numpy as np
+    from PIL import Image
+
+    deckgen = load_deckgen(tmp_path)
+    full = deckgen.preview_card(11)
+    small = deckgen.preview_card(11, size=(624, 600))
+    assert small.size == (624, 468)
+
+    reference = full.resize(small.size, Image.LANCZOS)
+    difference = np.abs(np.asarray(small, dtype=np.int16) - np.asarray(reference, dtype=np.int16))
+    assert difference.mean() < 4
+
+    frames = list(deckgen.preview_card_progressive(11, scale=0.25))
+    assert [frame.size for frame in frames] == [(78, 58), (624, 468)]
+
+
+def test_iter_cards_streams_a_subset_in_memory(tmp_path):
+    import pytest
+
+    deckgen = load_deckgen(tmp_path)
+    cards = deckgen.iter_cards([51, 0, 14], scale=0.1)
+    card_id, suit, value, image = next(cards)
+    assert (card_id, suit, value) == (51, 'spades', 'A')
+    assert image.size == (250, 187)
+    assert [(card_id, suit, value) for card_id, suit, value, _ in cards] == [(0, 'heart', '2'), (14, 'diamond', '3')]
+    assert card_files(tmp_path / "out") == []
+
+    with pytest.raises(ValueError):
+        list(deckgen.iter_cards([52]))
+
+
+def test_vectorized_recolor_matches_pillow_colorize():
+    import numpy as np
+    from PIL import Image, ImageOps
+    from deckgen import CardConstants, recolor_suits, suit_tone_lut
+
+    rng = np.random.default_rng(7)
+    images = {suit: Image.fromarray(rng.integers(0, 256, (64, 48, 4), dtype=np.uint8), 'RGBA')
+              for suit in ['heart', 'diamond', 'club', 'spades']}
+    images['spades'] = images['spades'].resize((30, 30))
+
+    recolored = recolor_suits(images, {suit: suit_tone_lut(suit, {}) for suit in images})
+    for suit, image in images.items():
+        color = CardConstants.RED_COLOR if suit in ['heart', 'diamond'] else CardConstants.BLACK_COLOR
+        expected = ImageOps.colorize(ImageOps.grayscale(image), (0, 0, 0), color)
+        expected.putalpha(image.getchannel('A'))
+        assert recolored[suit].tobytes() == expected.tobytes()
+
+
+def test_tone_lut_gradient_and_two_tone():
+    from deckgen import tone_lut
+
+    two_tone = tone_lut([(10, 20, 30), (200, 210, 220)], "steps")
+    assert tuple(two_tone[0]) == (10, 20, 30) and tuple(two_tone[127]) == (10, 20, 30)
+    assert tuple(two_tone[128]) == (200, 210, 220) and tuple(two_tone[255]) == (200, 210, 220)
+
+    gradient = tone_lut([(0, 0, 0), (255, 0, 0), (255, 255, 255)])
+    assert tuple(gradient[0]) == (0, 0, 0)
+    assert tuple(gradient[128]) == (255, 0, 0)
+    assert tuple(gradient[255]) == (255, 255, 255)
+
+
+def test_atlas_layout_packs_faces_and_shared_back(tmp_path):
+    import json
+    from PIL import Image
+
+    deckgen = load_deckgen(tmp_path)
+    deckgen.parameters["app_params"]["Generation"].update(
+        {"output layout": "atlas", "atlas columns": 10, "atlas rows": 3, "atlas scale": 0.1})
+    assert deckgen.generate_deck() == 3
+
+    index = json.loads((tmp_path / "out" / "test_card_atlas.json").read_text())
+    assert index["pages"] == ["test_card_atlas_00.png", "test_card_atlas_01.png"]
+    assert len(index["cells"]) == 53
+    cell = index["cells"]["test_card_40_2_S"]
+    assert (cell["page"], cell["x"], cell["y"]) == (1, 9 * 125, 0)
+    assert index["cells"]["test_card_back"]["page"] == 1
+
+    # The atlas cell holds the face as rendered at the same scale
+    page = Image.open(tmp_path / "out" / index["pages"][cell["page"]])
+    face = deckgen.preview_card(39, scale=0.1).crop((0, 0, cell["w"], cell["h"]))
+    assert page.crop((cell["x"], cell["y"], cell["x"] + cell["w"], cell["y"] + cell["h"])).tobytes() == face.tobytes()
+
+
+def test_pyramid_levels_written_in_one_pass(tmp_path):
+    from PIL import Image
+
+    deckgen = load_deckgen(tmp_path, n_card_gen=2)
+    deckgen.parameters["app_params"]["Generation"].update({"pyramid scales": [0.25, 0.5], "writer threads": 1})
+    assert deckgen.generate_deck() == 2
+
+    out = tmp_path / "out"
+    assert card_files(out) == ["test_card_01_2_H.png", "test_card_02_3_H.png"]
+    assert card_files(out / "1248x936") == card_files(out)
+    assert Image.open(out / "624x468" / "test_card_02_3_H.png").size == (624, 468)
+
+    # A missing or rewritten pyramid level is regenerated by an incremental run
+    os.remove(out / "624x468" / "test_card_01_2_H.png")
+    Image.new('RGB', (1248, 936)).save(out / "1248x936" / "test_card_02_3_H.png")
+    assert deckgen.generate_deck() == 2
+    assert deckgen.generate_deck() == 0
+
+    # Changing the pyramid invalidates the manifest entries
+    deckgen.parameters["app_params"]["Generation"]["pyramid scales"] = [0.5]
+    deckgen.loadParams(deckgen.parameters)
+    deckgen.input_data.n_card_gen = 2
+    assert deckgen.generate_deck() == 2
+
+
+def test_split_layout_writes_fronts_and_one_back(tmp_path):
+    import json
+    from PIL import Image
+
+    deckgen = load_deckgen(tmp_path, n_card_gen=3)
+    deckgen.parameters["app_params"]["Generation"].update({"output layout": "split", "incremental": False})
+    assert deckgen.generate_deck() == 3
+
+    out = tmp_path / "out"
+    assert card_files(out) == ["test_card_01_2_H.png", "test_card_02_3_H.png", "test_card_03_4_H.png", "test_card_back.png"]
+    front = Image.open(out / "test_card_02_3_H.png")
+    assert front.size == (1248, 1872)
+    assert front.convert('RGB').tobytes() == deckgen.preview_card(1).crop((0, 0, 1248, 1872)).tobytes()
+    assert Image.open(out / "test_card_back.png").size == (1248, 1872)
+
+    manifest = json.loads((out / "deckgen_manifest.json").read_text())
+    assert manifest["cards"]["test_card_03_4_H.png"]["back"] == "test_card_back.png"
+    assert "test_card_back.png" in manifest["cards"]
+
+
+def test_layout_edited_in_place_rewrites_the_cards(tmp_path):
+    from PIL import Image
+
+    deckgen = load_deckgen(tmp_path, n_card_gen=2)
+    assert deckgen.generate_deck() == 2
+    assert Image.open(tmp_path / "out" / "test_card_01_2_H.png").size == (2496, 1872)
+
+    # Generation params are read at generation time, and so is the fingerprint built from them
+    deckgen.parameters["app_params"]["Generation"]["output layout"] = "split"
+    assert deckgen.generate_deck() == 2
+    assert Image.open(tmp_path / "out" / "test_card_01_2_H.png").size == (1248, 1872)
+    assert deckgen.generate_deck() == 0
+
+
+def test_unknown_generation_choices_are_rejected(tmp_path):
+    import pytest
+
+    deckgen = load_deckgen(tmp_path, n_card_gen=1)
+    for key, value in (("output layout", "atlass"), ("compositor", "torch")):
+        parameters = copy.deepcopy(deckgen.parameters)
+        parameters["app_params"]["Generation"][key] = value
+        with pytest.raises(ValueError, match=f"Unknown {key}: {value}"):
+            DeckGen().loadParams(parameters)
+
+        # A value edited in place after loading fails at generation time instead of falling back
+        edited = load_deckgen(tmp_path, n_card_gen=1)
+        edited.parameters["app_params"]["Generation"][key] = value
+        with pytest.raises(ValueError):
+            edited.generate_deck()
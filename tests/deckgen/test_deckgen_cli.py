@@ -0,0 +1,101 @@
+import os
+import json
+import argparse
+import pytest
+import yaml
+from PIL import Image
+
+from deckgen import DeckGen
+from deckgen_cli import load_config, main, parse_shard, parse_sweep, run_batch
+from tests.deckgen.fixture_assets import make_input_folder, make_parameters
+
+
+def write_configs(tmp_path, count):
+    input_folder = make_input_folder(str(tmp_path / "input"))
+    paths = []
+    for i in range(count):
+        parameters = make_parameters(input_folder, str(tmp_path / f"deck{i}"), **{"main suit scale": 0.5 + i / 4})
+        path = tmp_path / f"deck{i}.yaml"
+        path.write_text(yaml.dump(parameters))
+        paths.append(str(path))
+    return paths
+
+
+def test_parse_shard():
+    assert parse_shard("1/4") == (1, 4)
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_shard("4/4")
+
+
+def test_shards_split_the_batch_without_overlap(tmp_path):
+    paths = write_configs(tmp_path, 2)
+    first = run_batch(paths, shard=(0, 40), asset_cache=str(tmp_path / "cache"))
+    second = run_batch(paths, shard=(1, 40), asset_cache=str(tmp_path / "cache"))
+
+    assert first.cards == 3 and second.cards == 3
+    assert sorted(os.listdir(tmp_path / "deck0")) == [
+        "deckgen_manifest.json", "test_card_01_2_H.png", "test_card_02_3_H.png",
+        "test_card_41_3_S.png", "test_card_42_4_S.png"]
+    assert sorted(os.listdir(tmp_path / "deck1")) == [
+        "deckgen_manifest.json", "test_card_29_4_C.png", "test_card_30_5_C.png"]
+
+    # Re-running a shard finds its cards up to date
+    again = run_batch(paths, shard=(0, 40), asset_cache=str(tmp_path / "cache"))
+    assert again.cards == 0 and again.skipped == 3
+    assert "throughput" in again.report()
+
+
+def test_split_layout_writes_fronts_only(tmp_path):
+    input_folder = make_input_folder(str(tmp_path / "input"))
+    parameters = make_parameters(input_folder, str(tmp_path / "deck"))
+    parameters["app_params"]["Generation"]["output layout"] = "split"
+    path = tmp_path / "deck.yaml"
+    path.write_text(yaml.dump(parameters))
+
+    assert run_batch([str(path)], shard=(0, 26)).cards == 2
+    assert sorted(os.listdir(tmp_path / "deck")) == [
+        "deckgen_manifest.json", "test_card_01_2_H.png", "test_card_27_2_C.png", "test_card_back.png"]
+
+    # The written file is the card's front half, not the whole card squashed to the front's size
+    deckgen = DeckGen()
+    deckgen.loadParams(parameters)
+    front = deckgen.generator.render_card(26, 'club', '2', face_only=True)
+    with Image.open(tmp_path / "deck" / "test_card_27_2_C.png") as written:
+        assert written.size == front.size
+        assert written.convert('RGB').tobytes() == front.convert('RGB').tobytes()
+
+
+def test_atlas_layout_writes_pages_and_index(tmp_path):
+    paths = write_configs(tmp_path, 2)
+    parameters = load_config(paths[1])
+    parameters["app_params"]["Generation"].update({"output layout": "atlas", "atlas scale": 0.05})
+    with open(paths[1], 'w') as f:
+        yaml.dump(parameters, f)
+
+    # The atlas deck is one task of the shard order, after deck0's 52 cards
+    assert run_batch(paths, shard=(52, 53)).cards == 1
+    assert sorted(os.listdir(tmp_path / "deck1")) == ["test_card_atlas.json", "test_card_atlas_00.png"]
+    with open(tmp_path / "deck1" / "test_card_atlas.json") as f:
+        cells = json.load(f)["cells"]
+    assert len(cells) == 53 and "test_card_back" in cells
+
+
+def test_sweep_writes_a_grid_per_config(tmp_path, capsys):
+    assert parse_sweep("recolor mode=gradient,steps").values == ["gradient", "steps"]
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_sweep("recolor mode")
+
+    paths = write_configs(tmp_path, 2)
+    assert main(paths + ["--sweep", "main suit scale=0.5:1.5:3", "--sweep-card", "5", "--sweep-scale", "0.05"]) == 0
+    for i in range(2):
+        assert os.listdir(tmp_path / f"deck{i}") == ["test_card_sweep.png"]
+
+    # One cell per value, each showing a differently sized central suit
+    deckgen = DeckGen()
+    deckgen.loadParams(load_config(paths[0]))
+    cell_w, cell_h = deckgen.preview_generator(0.05).half_card_size
+    with Image.open(tmp_path / "deck0" / "test_card_sweep.png") as grid:
+        assert grid.width == 3 * (cell_w + 6) + 6
+        cells = [grid.crop((x, 6, x + cell_w, 6 + cell_h)).tobytes() for x in range(6, grid.width, cell_w + 6)]
+    assert len(set(cells)) == 3
+    assert "test_card_sweep.png" in capsys.readouterr().out
@@ -0,0 +1,137 @@
+import copy
+import json
+import os
+
+import pytest
+from PIL import Image
+
+from contact_sheet import ContactSheet
+from deckgen import DeckGen
+from param_graph import ALL_STAGES, changed_params, invalidated_stages
+from tests.deckgen.fixture_assets import make_input_folder, make_parameters
+
+
+def test_invalidated_stages_follow_the_graph():
+    old = make_parameters("in", "out")
+    new = copy.deepcopy(old)
+    assert invalidated_stages(old, new) == set()
+    assert invalidated_stages(None, new) == ALL_STAGES
+
+    new["app_params"]["Design"]["Preview index"] = 7
+    new["app_params"]["Generation"]["workers"] = 4
+    assert changed_params(old, new) == {("Design", "Preview index"), ("Generation", "workers")}
+    assert invalidated_stages(old, new) == set()
+
+    # The index margin is fixed, so the margin keys change no output
+    new["app_params"]["Design"]["card value margin"] = 30
+    assert invalidated_stages(old, new) == set()
+
+    new["app_params"]["Design"]["main suit scale"] = 0.5
+    assert invalidated_stages(old, new) == {"main suit", "suit base", "card", "output"}
+
+    new["app_params"]["Design"]["recolor mode"] = "steps"
+    assert "index stamps" in invalidated_stages(old, new)
+
+    new["app_params"]["Design"]["unknown key"] = 1
+    assert invalidated_stages(old, new) == ALL_STAGES
+
+
+@pytest.mark.parametrize("section, key, value", [
+    ("Design", "main suit scale", 0.6),
+    ("Design", "recolor mode", "steps"),
+    ("Design", "suit rendering", "sdf"),
+    ("Generation", "raster backend", "opencv"),
+])
+def test_partial_reload_matches_fresh_load(tmp_path, section, key, value):
+    input_folder = make_input_folder(str(tmp_path / "input"))
+    parameters = make_parameters(input_folder, str(tmp_path / "out"))
+    deckgen = DeckGen()
+    deckgen.loadParams(parameters)
+    for card in (3, 40):
+        deckgen.preview_card(card)
+        deckgen.preview_card(card, scale=0.3)
+
+    parameters = copy.deepcopy(parameters)
+    parameters["app_params"][section][key] = value
+    deckgen.loadParams(parameters)
+    fresh = DeckGen()
+    fresh.loadParams(copy.deepcopy(parameters))
+
+    for card in (3, 40):
+        assert deckgen.preview_card(card).tobytes() == fresh.preview_card(card).tobytes()
+        assert deckgen.preview_card(card, scale=0.3).tobytes() == fresh.preview_card(card, scale=0.3).tobytes()
+
+
+def test_unaffected_layers_are_reused(tmp_path):
+    parameters = make_parameters(make_input_folder(str(tmp_path / "input")), str(tmp_path / "out"))
+    deckgen = DeckGen()
+    deckgen.loadParams(parameters)
+    generator = deckgen.generator
+    preview = deckgen.preview_generator(0.25)
+    deckgen.preview_card(5)
+    deckgen.preview_card(5, scale=0.25)
+    stamps, preview_stamps = generator.index_stamps('7', 'heart'), preview.index_stamps('7', 'heart')
+    base, preview_font = generator.suit_base('heart'), preview.input_data.font
+
+    # The central suit only changes the suit bases; index stamps and the scaled font are kept
+    parameters = copy.deepcopy(parameters)
+    parameters["app_params"]["Design"]["main suit scale"] = 0.5
+    deckgen.loadParams(parameters)
+    assert deckgen.generator is generator and deckgen.preview_generator(0.25) is preview
+    assert generator.index_stamps('7', 'heart') is stamps
+    assert preview.index_stamps('7', 'heart') is preview_stamps
+    assert preview.input_data.font is preview_font
+    assert generator.suit_base('heart') is not base
+
+    # Parameters that affect no rendered layer keep everything
+    base = generator.suit_base('heart')
+    parameters = copy.deepcopy(parameters)
+    parameters["app_params"]["Design"]["Preview index"] = 9
+    deckgen.loadParams(parameters)
+    assert deckgen.invalidated == set()
+    assert generator.suit_base('heart') is base
+
+    # A suit source edited on disk is picked up even though no parameter changed
+    suit_path = os.path.join(parameters["input_folder"], "suit-heart.png")
+    os.utime(suit_path, ns=(os.stat(suit_path).st_atime_ns, os.stat(suit_path).st_mtime_ns + 10**9))
+    deckgen.loadParams(parameters)
+    assert {"suit shapes", "index stamps", "suit base"} <= deckgen.invalidated
+    assert generator.index_stamps('7', 'heart') is not stamps
+
+
+def test_renamed_prefix_reaches_the_atlas(tmp_path):
+    parameters = make_parameters(make_input_folder(str(tmp_path / "input")), str(tmp_path / "out"))
+    parameters["app_params"]["Generation"].update({"output layout": "atlas", "atlas scale": 0.05})
+    deckgen = DeckGen()
+    deckgen.loadParams(parameters)
+    deckgen.generate_deck()
+
+    parameters = copy.deepcopy(parameters)
+    parameters["prefix_string"] = "renamed"
+    deckgen.loadParams(parameters)
+    deckgen.generate_deck()
+    with open(tmp_path / "out" / "renamed_atlas.json") as f:
+        cells = json.load(f)["cells"]
+    assert "renamed_01_2_H" in cells and "renamed_back" in cells
+    assert not any(name.startswith("test_card") for name in cells)
+
+
+def test_switched_input_folder_invalidates_thumbnails(tmp_path):
+    parameters = make_parameters(make_input_folder(str(tmp_path / "input")), str(tmp_path / "out"))
+    other_folder = make_input_folder(str(tmp_path / "other"))
+    Image.new('RGB', (624, 936), (90, 160, 90)).save(os.path.join(other_folder, "im-front-01.png"))
+    deckgen = DeckGen()
+    deckgen.loadParams(parameters)
+    sheet = ContactSheet(scale=0.05)
+    sheet.render(deckgen, workers=2)
+
+    parameters = copy.deepcopy(parameters)
+    parameters["input_folder"] = other_folder
+    deckgen.loadParams(parameters)
+    image = sheet.render(deckgen, workers=2)
+    assert (sheet.rendered, sheet.reused) == (52, 0)
+
+    fresh = DeckGen()
+    fresh.loadParams(copy.deepcopy(parameters))
+    face = fresh.preview_generator(0.05).render_card(0, 'heart', '2', face_only=True)
+    assert image.crop((4, 4) + tuple(4 + d for d in face.size)).tobytes() == face.tobytes()
@@ -0,0 +1,97 @@
+import copy
+import os
+
+import pytest
+
+from asset_cache import AssetMemo
+from deckgen import DeckGen
+from param_sweep import parse_axis, parse_values, resolve_param, sweep_variants
+from tests.deckgen.fixture_assets import make_input_folder, make_parameters
+
+
+def test_parse_axis():
+    assert parse_values("0.6:1.2:4") == [0.6, 0.8, 1.0, 1.2]
+    assert parse_values("10:40:4") == [10, 20, 30, 40]
+    assert parse_values("gradient, steps") == ["gradient", "steps"]
+    assert parse_values("true,false") == [True, False]
+
+    assert resolve_param("main suit scale") == ("Design", "main suit scale")
+    assert resolve_param("compositor") == ("Generation", "compositor")
+    assert resolve_param("Generation/workers") == ("Generation", "workers")
+
+    axis = parse_axis("main suit scale=0.5:1.5:3")
+    assert axis.path == ("Design", "main suit scale") and axis.values == [0.5, 1.0, 1.5]
+    assert axis.label(1.0) == "main suit scale=1.0"
+    for spec in ("main suit scale", "=1,2", "main suit scale=", "main suit scale=1:2:0"):
+        with pytest.raises(ValueError):
+            parse_axis(spec)
+
+
+def test_sweep_variants_order():
+    parameters = make_parameters("in", "out")
+    axes = [parse_axis("main suit scale=0.5,1.0"), parse_axis("recolor mode=gradient,steps,none")]
+    variants = sweep_variants(parameters, axes)
+
+    assert [labels for labels, _ in variants][:3] == [
+        ["main suit scale=0.5", "recolor mode=gradient"],
+        ["main suit scale=1.0", "recolor mode=gradient"],
+        ["main suit scale=0.5", "recolor mode=steps"],
+    ]
+    design = variants[5][1]["app_params"]["Design"]
+    assert (design["main suit scale"], design["recolor mode"]) == (1.0, "none")
+    assert parameters["app_params"]["Design"] == make_parameters("in", "out")["app_params"]["Design"]
+
+
+def test_sweep_grid_matches_fresh_renders(tmp_path):
+    parameters = make_parameters(make_input_folder(str(tmp_path / "input")), str(tmp_path / "out"))
+    deckgen = DeckGen()
+    deckgen.loadParams(parameters)
+    axes = [parse_axis("main suit scale=0.5:1.1:3"), parse_axis("recolor mode=gradient,steps")]
+
+    grid = deckgen.sweep(axes, card_number=11, scale=0.1, workers=3)
+    # Every asset role is built once per distinct key: back, front and font only once
+    misses = deckgen.sweep_memo.misses
+    assert misses < 6 * 7
+
+    # Each cell is the card face a fresh DeckGen renders for that variant at the same scale
+    cells = []
+    for index in (0, 1, 4):
+        variant = copy.deepcopy(parameters)
+        variant["app_params"]["Design"]["main suit scale"] = [0.5, 0.8, 1.1][index % 3]
+        variant["app_params"]["Design"]["recolor mode"] = ["gradient", "steps"][index // 3]
+        fresh = DeckGen()
+        fresh.loadParams(variant)
+        face = fresh.preview_generator(0.1).render_card(11, 'heart', 'K', face_only=True)
+        cell_w, cell_h = face.size
+        assert grid.size[0] == 3 * (cell_w + 6) + 6
+        row, column = divmod(index, 3)
+        x, y = 6 + column * (cell_w + 6), 6 + row * ((grid.size[1] - 6) // 2)
+        assert grid.crop((x, y, x + cell_w, y + cell_h)).tobytes() == face.tobytes()
+        cells.append(face.tobytes())
+    assert len(set(cells)) == 3
+    assert not os.listdir(tmp_path / "out")
+
+    # A repeated sweep finds every asset in the memo
+    assert deckgen.sweep(axes, card_number=11, scale=0.1).tobytes() == grid.tobytes()
+    assert deckgen.sweep_memo.misses == misses
+
+
+def test_sweep_axis_count_and_stop(tmp_path):
+    parameters = make_parameters(make_input_folder(str(tmp_path / "input")), str(tmp_path / "out"))
+    deckgen = DeckGen()
+    deckgen.loadParams(parameters)
+    axis = parse_axis("main suit scale=0.5,1.0")
+    for axes in ([], [axis, axis, axis]):
+        with pytest.raises(ValueError):
+            deckgen.sweep(axes)
+    assert deckgen.sweep([axis], stop_callback=lambda: True) is None
+
+
+def test_asset_memo_capacity():
+    memo = AssetMemo(capacity=2)
+    built = []
+    for key in ("a", "b", "a", "c", "a", "b"):
+        memo.get("back", key, lambda: built.append(key) or key)
+    # "b" was the least recently used when "c" arrived
+    assert built == ["a", "b", "c", "b"]
+    assert memo.contains("back", "a") and memo.contains("back", "b") and not memo.contains("back", "c")
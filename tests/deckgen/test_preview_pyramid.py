@@ -0,0 +1,37 @@
+import numpy as np
+from PIL import Image
+
+from preview_pyramid import PreviewPyramid
+
+
+def card_image(size=(1248, 936)):
+    rng = np.random.default_rng(7)
+    return Image.fromarray(rng.integers(0, 256, (size[1], size[0], 3), dtype=np.uint8), 'RGB')
+
+
+def test_pyramid_levels_and_fit():
+    pyramid = PreviewPyramid(card_image(), min_size=64)
+    assert [level.size for level in pyramid.levels] == [(1248, 936), (624, 468), (312, 234), (156, 117)]
+    assert pyramid.fit((600, 1000)) == (600, 450)
+    assert pyramid.fit((1000, 300)) == (400, 300)
+    assert pyramid.level_for((300, 225)).size == (312, 234)
+    assert pyramid.level_for((2000, 1500)).size == (1248, 936)
+
+
+def test_draft_and_final_frames():
+    image = card_image()
+    pyramid = PreviewPyramid(image, cached_frames=2)
+    assert pyramid.draft((300, 225)).size == (300, 225)
+    assert pyramid.cached_frame((300, 225)) is None
+
+    converted = []
+    final = pyramid.frame((300, 225), lambda frame: converted.append(frame) or frame)
+    assert final.tobytes() == image.resize((300, 225), Image.LANCZOS).tobytes()
+    assert pyramid.frame((300, 225), converted.append) is final
+    assert len(converted) == 1
+
+    # Only the most recently used sizes are kept
+    pyramid.frame((200, 150))
+    pyramid.frame((100, 75))
+    assert pyramid.cached_frame((300, 225)) is None
+    assert pyramid.cached_frame((200, 150)) is not None
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from deckgen import DeckGen
+from raster_backend import get_backend
+from tests.deckgen.fixture_assets import make_input_folder, make_parameters
+
+
+def difference(image, reference):
+    return np.abs(np.asarray(image, dtype=np.int16) - np.asarray(reference, dtype=np.int16))
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        get_backend("vips")
+
+
+def test_opencv_primitives_match_pillow():
+    pillow, opencv = get_backend("pillow"), get_backend("opencv")
+    rng = np.random.default_rng(3)
+    src = Image.fromarray(rng.integers(0, 256, (40, 30, 4), dtype=np.uint8), 'RGBA')
+    dst = Image.fromarray(rng.integers(0, 256, (64, 64, 3), dtype=np.uint8), 'RGB')
+
+    assert opencv.rotate180(src).tobytes() == pillow.rotate180(src).tobytes()
+
+    expected, actual = dst.copy(), dst.copy()
+    pillow.paste(expected, src, (50, -5))
+    opencv.paste(actual, src, (50, -5))
+    assert difference(actual, expected).max() <= 1
+
+    gradient = Image.fromarray(np.tile(np.arange(256, dtype=np.uint8), (256, 1)), 'L').convert('RGB')
+    assert difference(opencv.resize(gradient, (64, 64)), pillow.resize(gradient, (64, 64))).max() <= 3
+
+
+def test_opencv_card_matches_pillow_card(tmp_path):
+    input_folder = make_input_folder(str(tmp_path / "input"))
+    cards = {}
+    for backend in ("pillow", "opencv"):
+        parameters = make_parameters(input_folder, str(tmp_path / "out"), **{"main suit scale": 0.8})
+        parameters["app_params"]["Generation"]["raster backend"] = backend
+        deckgen = DeckGen()
+        deckgen.loadParams(parameters)
+        cards[backend] = deckgen.preview_card(36)
+
+    diff = difference(cards["opencv"], cards["pillow"])
+    assert diff.mean() < 0.5
+    assert np.percentile(diff, 99.9) <= 64
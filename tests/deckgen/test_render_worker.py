@@ -0,0 +1,136 @@
+import threading
+
+from deckgen import DeckGen
+from render_worker import RenderWorker
+from tests.deckgen.fixture_assets import make_input_folder, make_parameters
+
+
+def wait_for(worker, event, timeout=30):
+    """Drain worker events (as the GUI's after() polling does) until event is set."""
+    for _ in range(int(timeout / 0.01)):
+        worker.drain_events()
+        if event.wait(0.01):
+            worker.drain_events()
+            return
+    raise AssertionError("worker did not finish in time")
+
+
+def test_preview_runs_between_cards_of_a_generation():
+    worker = RenderWorker()
+    order = []
+    finished = threading.Event()
+    started = threading.Event()
+
+    def generation(w):
+        started.set()
+        for card in range(5):
+            if w.should_stop():
+                break
+            order.append(f"card {card}")
+            if card == 1:
+                w.submit(RenderWorker.PREVIEW, lambda _: order.append("stale preview"))
+                w.submit(RenderWorker.PREVIEW, lambda _: order.append("preview") or "image", results.append)
+        return len(order)
+
+    results = []
+    worker.submit(RenderWorker.GENERATE, generation, lambda n: (results.append(n), finished.set()))
+    wait_for(worker, finished)
+    worker.shutdown()
+
+    # Only the latest preview runs, at the next card boundary, on the worker thread
+    assert order == ["card 0", "card 1", "preview", "card 2", "card 3", "card 4"]
+    assert results == ["image", 6]
+
+
+def test_stop_and_errors_are_reported():
+    worker = RenderWorker()
+    done = threading.Event()
+    rendered = []
+
+    def generation(w):
+        while not w.should_stop():
+            rendered.append(len(rendered))
+            if len(rendered) == 3:
+                w.request_stop()
+        return len(rendered)
+
+    worker.submit(RenderWorker.GENERATE, generation, lambda n: rendered.append(f"done {n}"))
+    worker.submit(RenderWorker.PREVIEW, lambda w: 1 / 0, on_error=lambda e: (rendered.append(type(e).__name__), done.set()))
+    wait_for(worker, done)
+    worker.shutdown()
+
+    assert "ZeroDivisionError" in rendered
+    assert "done 3" in rendered
+    assert not worker.busy
+
+
+def test_generate_deck_on_worker_with_stop(tmp_path):
+    parameters = make_parameters(make_input_folder(str(tmp_path / "input")), str(tmp_path / "out"))
+    worker = RenderWorker()
+    progress = []
+    done = threading.Event()
+
+    def generation(w):
+        deckgen = DeckGen(parameters)
+        deckgen.loadParams(parameters)
+
+        def card_written(completed, total, filename):
+            progress.append((completed, total))
+            if completed == 4:
+                w.request_stop()
+
+        return deckgen.generate_deck(stop_callback=w.should_stop, progress_callback=card_written)
+
+    results = []
+    worker.submit(RenderWorker.GENERATE, generation, lambda written: (results.append(written), done.set()))
+    wait_for(worker, done, timeout=120)
+    worker.shutdown()
+
+    assert results == [4]
+    assert progress[-1] == (4, 52)
+
+
+def test_sheet_runs_inside_generation_and_previews_inside_sheet():
+    worker = RenderWorker()
+    order = []
+    finished = threading.Event()
+
+    def sheet(w):
+        order.append("sheet")
+        w.submit(RenderWorker.PREVIEW, lambda _: order.append("preview"))
+        w.submit(RenderWorker.SHEET, lambda _: order.append("next sheet"))
+        w.should_stop()
+        order.append("sheet done")
+
+    def generation(w):
+        w.submit(RenderWorker.SHEET, sheet)
+        w.should_stop()
+        order.append("generation done")
+
+    worker.submit(RenderWorker.GENERATE, generation, lambda _: finished.set())
+    wait_for(worker, finished)
+    worker.shutdown()
+
+    # A sheet only lets previews cut in; the queued sheet runs after it, still inside the generation
+    assert order == ["sheet", "preview", "sheet done", "next sheet", "generation done"]
+
+
+def test_jobs_of_another_kind_are_not_replaced():
+    worker = RenderWorker()
+    order = []
+    finished = threading.Event()
+    started = threading.Event()
+    release = threading.Event()
+
+    worker.submit(RenderWorker.GENERATE, lambda w: started.set() or release.wait(10))
+    assert started.wait(10)
+    worker.submit(RenderWorker.SHEET, lambda _: order.append("old sheet"))
+    worker.submit(RenderWorker.SHEET, lambda _: order.append("sweep"), kind="sweep")
+    worker.submit(RenderWorker.SHEET, lambda _: order.append("sheet"))
+    worker.submit(RenderWorker.GENERATE, lambda _: None, lambda _: finished.set())
+    release.set()
+    wait_for(worker, finished)
+    worker.shutdown()
+
+    # The newer sheet replaced the older one; the sweep queued between them still ran
+    assert order == ["sweep", "sheet"]
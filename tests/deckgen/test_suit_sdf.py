@@ -0,0 +1,47 @@
+import numpy as np
+from PIL import Image, ImageDraw
+
+from deckgen import DeckGen
+from suit_sdf import SuitSDF
+from tests.deckgen.fixture_assets import make_input_folder, make_parameters
+
+
+def disc(size=512, radius=200):
+    image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    c = size // 2
+    ImageDraw.Draw(image).ellipse((c - radius, c - radius, c + radius, c + radius), fill=(200, 10, 10, 255))
+    return image
+
+
+def test_sdf_mask_matches_shape_at_any_size():
+    sdf = SuitSDF.from_image(disc())
+    for size in (24, 61, 700):
+        mask = np.asarray(sdf.mask((size, size)), dtype=np.float32) / 255
+        expected_area = np.pi * (200 / 512 * size) ** 2
+        assert abs(mask.sum() - expected_area) / expected_area < 0.03
+        # The edge stays about one pixel wide whatever the target size
+        partial = ((mask > 0.05) & (mask < 0.95)).sum()
+        assert partial < 4 * np.pi * 200 / 512 * size
+
+
+def test_sdf_render_is_cached_per_size():
+    sdf = SuitSDF.from_image(disc())
+    image = sdf.render((40, 40))
+    assert image.mode == 'RGBA' and image.size == (40, 40)
+    assert sdf.render((40, 40)) is image
+    assert np.asarray(image)[20, 20, :3].tolist() == [200, 10, 10]
+
+
+def test_sdf_suit_rendering_deck(tmp_path):
+    input_folder = make_input_folder(str(tmp_path / "input"))
+    cards = {}
+    for rendering in ("raster", "sdf"):
+        deckgen = DeckGen()
+        deckgen.loadParams(make_parameters(input_folder, str(tmp_path / "out"),
+                                           **{"main suit scale": 0.7, "suit rendering": rendering}))
+        cards[rendering] = deckgen.preview_card(12)
+    assert set(deckgen.input_data.suit_shapes) == {'heart', 'diamond', 'club', 'spades'}
+    assert deckgen.input_data.suit_images['heart'].size == (358, 358)
+
+    diff = np.abs(np.asarray(cards["sdf"], dtype=np.int16) - np.asarray(cards["raster"], dtype=np.int16))
+    assert diff.mean() < 0.5
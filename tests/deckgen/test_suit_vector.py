@@ -0,0 +1,65 @@
+import os
+import numpy as np
+from PIL import Image, ImageDraw
+
+from deckgen import DeckGen
+from suit_vector import SuitPath, load_suit_path, load_suit_paths, sidecar_path
+from tests.deckgen.fixture_assets import make_input_folder, make_parameters
+
+
+def save_disc(path, radius=200, size=512):
+    image = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+    c = size // 2
+    ImageDraw.Draw(image).ellipse((c - radius, c - radius, c + radius, c + radius), fill=(20, 20, 20, 255))
+    image.save(path)
+    return path
+
+
+def test_suit_path_rasterizes_at_any_size(tmp_path):
+    path = SuitPath.fit(Image.open(save_disc(str(tmp_path / "suit-heart.png"))), 0.0001, 100)
+    assert path.size == (512, 512) and len(path.polygon) == 100
+    for size in (30, 700):
+        mask = np.asarray(path.mask((size, size)), dtype=np.float32) / 255
+        expected_area = np.pi * (200 / 512 * size) ** 2
+        assert abs(mask.sum() - expected_area) / expected_area < 0.03
+        # Supersampling leaves partially covered pixels along the edge only
+        assert ((mask > 0) & (mask < 1)).sum() < 3 * np.pi * 200 / 512 * size
+
+
+def test_suit_path_sidecar_is_reused_until_source_changes(tmp_path):
+    source = save_disc(str(tmp_path / "suit-club.png"))
+    first = load_suit_path(source, 0.0001, 100)
+    sidecar = sidecar_path(source)
+    mtime = os.stat(sidecar).st_mtime_ns
+
+    assert load_suit_path(source, 0.0001, 100) == first
+    assert os.stat(sidecar).st_mtime_ns == mtime
+
+    # A different fit parameter or a changed source refits
+    assert len(load_suit_path(source, 0.0001, 64).polygon) == 64
+    save_disc(source, radius=120)
+    refit = load_suit_path(source, 0.0001, 64)
+    assert max(x for x, _ in refit.polygon) < max(x for x, _ in first.polygon)
+
+
+def test_load_suit_paths_in_parallel(tmp_path):
+    sources = {suit: save_disc(str(tmp_path / f"suit-{suit}.png"), radius=100 + 20 * i)
+               for i, suit in enumerate(['heart', 'diamond', 'club', 'spades'])}
+    paths = load_suit_paths(sources, 0.0001, 100)
+    assert list(paths) == list(sources)
+    assert all(os.path.exists(sidecar_path(source)) for source in sources.values())
+
+
+def test_vector_suit_rendering_deck(tmp_path):
+    input_folder = make_input_folder(str(tmp_path / "input"))
+    cards = {}
+    for rendering in ("raster", "vector"):
+        deckgen = DeckGen()
+        deckgen.loadParams(make_parameters(input_folder, str(tmp_path / "out"),
+                                           **{"main suit scale": 0.7, "suit rendering": rendering}))
+        cards[rendering] = deckgen.preview_card(30)
+    assert deckgen.input_data.suit_images['club'].size == (358, 358)
+    assert os.path.exists(os.path.join(input_folder, "suit-club.png" + ".path.json"))
+
+    diff = np.abs(np.asarray(cards["vector"], dtype=np.int16) - np.asarray(cards["raster"], dtype=np.int16))
+    assert diff.mean() < 0.5